@@ -0,0 +1,115 @@
+"""
+Vectorized TSV Parser (pyarrow)
+===============================
+Optional parser backend for import_data.py. Reads IMDb TSV data in large
+blocks with pyarrow's multithreaded CSV reader and builds COPY text
+column-wise: \\N handling, defaults, boolean mapping and row filters are all
+array operations, so no Python object is created per row or field.
+
+Used when pyarrow is installed (or with --parser arrow); otherwise the
+importer falls back to its csv.DictReader path.
+"""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+NULL = "\\N"
+
+
+def copy_layouts(f, header, layouts, stream, staging, block_bytes, on_batch=None, keep=None,
+                 on_skip=None):
+    """
+    Parse TSV data lines from binary file `f` into the COPY buffer of every
+    layout (see import_data.Layout). Returns the number of rows written to
+    the first layout; on_batch, if given, is called with that count after
+    each block. keep, if given, maps each record batch to a mask of the
+    rows to use; it can only read columns the layouts use. Lines with the
+    wrong number of fields are skipped; on_skip, if given, is called with
+    how many there were at the end.
+    """
+    skipped = 0
+
+    def skip(row):
+        nonlocal skipped
+        skipped += 1
+        return "skip"
+
+    needed = sorted({src for layout in layouts for _, src, _ in layout.columns})
+    reader = pacsv.open_csv(
+        f,
+        read_options=pacsv.ReadOptions(column_names=header, block_size=block_bytes),
+        parse_options=pacsv.ParseOptions(
+            delimiter="\t", quote_char=False, escape_char=False,
+            invalid_row_handler=skip),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=needed,
+            column_types={c: pa.string() for c in needed},
+            null_values=[NULL, ""], strings_can_be_null=True),
+    )
+    buffers = [stream.table(staging.get(layout.target, layout.target),
+                            tuple(col for col, _, _ in layout.columns))
+               for layout in layouts]
+
+    for batch in reader:
+        if keep:
+            batch = batch.filter(keep(batch))
+        for layout, buf in zip(layouts, buffers):
+            text, rows = _copy_text(batch, layout)
+            if rows:
+                buf.write_block(text, rows)
+        if on_batch:
+            on_batch(buffers[0].rows)
+    if skipped and on_skip:
+        on_skip(skipped)
+    return buffers[0].rows
+
+
+def _copy_text(batch, layout):
+    """Render one record batch as COPY text for a layout. Returns (text, rows)."""
+    if layout.required:
+        keep = pc.and_(*[pc.is_valid(batch.column(c)) for c in layout.required]) \
+            if len(layout.required) > 1 else pc.is_valid(batch.column(layout.required[0]))
+        batch = batch.filter(keep)
+
+    arrays = [pc.fill_null(_transform(batch.column(src), how), NULL)
+              for _, src, how in layout.columns]
+    rows = len(arrays[0])
+    if rows == 0:
+        return "", 0
+    lines = pc.binary_join_element_wise(*arrays, "\t")
+    text = pc.binary_join(pa.ListArray.from_arrays([0, rows], lines), "\n")[0].as_py()
+    return text + "\n", rows
+
+
+def key_mask(batch, checks, digits):
+    """
+    Mask of the rows whose key columns are all in their key sets. `checks`
+    holds (column, bitmap, ID prefix, other keys) per key set, with the
+    bitmap laid out like an Arrow boolean array (see import_data.KeySet).
+    """
+    mask = None
+    for column, bits, prefix, other in checks:
+        arr = batch.column(column)
+        numeric = pc.match_substring_regex(arr, f"^{prefix}[0-9]{{1,{digits}}}$")
+        ids = pc.cast(pc.if_else(numeric, pc.utf8_slice_codeunits(arr, 2), "0"), pa.int64())
+        in_range = pc.and_(numeric, pc.less(ids, len(bits) * 8))
+        if bits:
+            members = pa.BooleanArray.from_buffers(pa.bool_(), len(bits) * 8,
+                                                   [None, pa.py_buffer(bits)])
+            found = pc.and_(in_range, pc.take(members, pc.if_else(in_range, ids, 0)))
+        else:
+            found = in_range
+        if other:
+            found = pc.or_(found, pc.is_in(arr, value_set=pa.array(sorted(other), pa.string())))
+        found = pc.fill_null(found, False)
+        mask = found if mask is None else pc.and_(mask, found)
+    return mask
+
+
+def _transform(arr, how):
+    if how is None:
+        return arr
+    if how == "bool":
+        return pc.fill_null(pc.if_else(pc.equal(arr, "1"), "t", "f"), "f")
+    return pc.fill_null(arr, how)
@@ -0,0 +1,125 @@
+"""
+Importer Benchmark
+==================
+Imports synthetic IMDb TSVs (see gen_tsv.py) into a scratch schema of the
+configured database and reports wall time, rows/s and MB/s per stage plus
+the importer's peak RSS. The scratch schema is dropped afterwards, so the
+live tables are never touched.
+
+Usage:
+    python import/bench_import.py                       # scale 1, sequential
+    python import/bench_import.py --scale 10 --gzip
+    python import/bench_import.py --parallel --workers 8
+    python import/bench_import.py --copy-format both    # text vs binary COPY
+    python import/bench_import.py --dir /data/imdb      # existing TSVs instead
+
+Expects the same .env database settings as import_data.py.
+"""
+
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import gen_tsv  # noqa: E402
+import import_data  # noqa: E402
+from psycopg2 import sql  # noqa: E402
+
+BENCH_SCHEMA = "imdb_bench"
+
+
+def run_sequential(conn):
+    """Import step by step; returns [(stage, rows, seconds, bytes)]."""
+    import_data.load_checkpoints(conn, resume=False)
+    results = []
+    for step, spec in import_data.STEPS.items():
+        path = import_data.find_tsv(spec[0])
+        start = time.perf_counter()
+        rows = import_data.import_step(conn, step)
+        results.append((step, rows, time.perf_counter() - start,
+                        path.stat().st_size if path else 0))
+    return results
+
+
+def run_parallel(workers):
+    paths = [import_data.find_tsv(spec[0]) for spec in import_data.STEPS.values()]
+    size = sum(path.stat().st_size for path in paths if path)
+    start = time.perf_counter()
+    import_data.import_parallel(workers)
+    return [("all (parallel)", None, time.perf_counter() - start, size)]
+
+
+def report(results):
+    print(f"\n{'stage':<16} {'rows':>12} {'seconds':>9} {'rows/s':>12} {'MB/s':>8}")
+    for stage, rows, seconds, size in results:
+        count, rate = (f"{rows:,}", f"{rows / seconds:,.0f}") if rows is not None else ("-", "-")
+        print(f"{stage:<16} {count:>12} {seconds:>9.2f} {rate:>12} "
+              f"{size / 1024 / 1024 / seconds:>8.1f}")
+    if len(results) > 1:
+        total_s = sum(r[2] for r in results)
+        total_rows = sum(r[1] for r in results)
+        total_mb = sum(r[3] for r in results) / 1024 / 1024
+        print(f"{'total':<16} {total_rows:>12,} {total_s:>9.2f} "
+              f"{total_rows / total_s:>12,.0f} {total_mb / total_s:>8.1f}")
+    print(f"\npeak RSS: {import_data.peak_rss_mb():,.0f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark import_data.py on synthetic IMDb data.")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help=f"generator scale factor; 1 = {gen_tsv.TITLES_PER_SCALE:,} titles")
+    parser.add_argument("--seed", type=int, default=42, help="generator random seed")
+    parser.add_argument("--gzip", action="store_true", help="generate .tsv.gz files")
+    parser.add_argument("--dir", type=Path,
+                        help="import the TSVs in this directory instead of generating them")
+    parser.add_argument("--parser", choices=("auto", "arrow", "csv"), default=import_data.IMPORT_PARSER,
+                        help="TSV parser backend")
+    parser.add_argument("--copy-format", choices=("text", "binary", "both"),
+                        default=import_data.IMPORT_COPY_FORMAT,
+                        help="COPY wire format; both runs the import once with each")
+    parser.add_argument("--parallel", action="store_true", help="benchmark import_data --parallel")
+    parser.add_argument("--workers", type=int, default=4, help="worker processes for --parallel")
+    args = parser.parse_args(argv)
+
+    tmp_dir = None
+    if args.dir:
+        import_data.TSV_DIR = args.dir
+    else:
+        tmp_dir = Path(tempfile.mkdtemp(prefix="imdb_bench_"))
+        with import_data.timer(f"Generating scale {args.scale:g} TSVs in {tmp_dir}"):
+            gen_tsv.generate(tmp_dir, args.scale, args.seed, args.gzip)
+        import_data.TSV_DIR = tmp_dir
+
+    import_data.IMPORT_PARSER = import_data.resolve_parser(args.parser)
+    import_data.SHADOW_SCHEMA = BENCH_SCHEMA
+    print(f"Parser: {import_data.IMPORT_PARSER}   Target: {BENCH_SCHEMA} "
+          f"in {import_data.DB_CONFIG['dbname']}\n")
+
+    formats = ("text", "binary") if args.copy_format == "both" else (args.copy_format,)
+    conn = import_data.get_conn()
+    try:
+        for copy_format in formats:
+            print(f"── COPY format: {copy_format}")
+            import_data.IMPORT_COPY_FORMAT = copy_format
+            import_data.prepare_shadow(conn)  # fresh, empty tables for every run
+            if args.parallel:
+                results = run_parallel(args.workers)
+            else:
+                results = run_sequential(conn)
+            report(results)
+            print()
+    finally:
+        conn.rollback()
+        cur = conn.cursor()
+        cur.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(BENCH_SCHEMA)))
+        conn.commit()
+        conn.close()
+        if tmp_dir:
+            shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
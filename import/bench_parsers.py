@@ -0,0 +1,80 @@
+"""
+TSV Parser Micro-Benchmark
+==========================
+Times each parser backend of import_data.py on every IMDb TSV it finds,
+without touching the database: COPY text is rendered and then discarded.
+
+Usage:
+    python import/bench_parsers.py                     # files in TSV_DIR
+    python import/bench_parsers.py --dir /data/imdb --repeat 3
+
+Reports rows/s and MB/s per TSV type and backend (best of --repeat runs).
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import import_data  # noqa: E402
+
+
+class NullBuffer:
+    """CopyBuffer stand-in that only counts what it is given."""
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = columns
+        self.rows = 0
+
+    def write(self, line):
+        self.rows += 1
+
+    def write_block(self, text, rows):
+        self.rows += rows
+
+
+class NullStream:
+    def table(self, table, columns):
+        return NullBuffer(table, columns)
+
+
+def bench(step, path, parser, repeat):
+    """Best wall time over `repeat` runs and the rows parsed."""
+    staging = {kind: f"tmp_{kind}" for kind in import_data.FK_STAGING}
+    best, rows = None, 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = import_data.parse_file(step, path, NullStream(), staging, parser=parser)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the importer's TSV parser backends.")
+    parser.add_argument("--dir", type=Path, default=import_data.TSV_DIR,
+                        help="directory holding the TSV / TSV.gz files (default: TSV_DIR)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per file and backend")
+    args = parser.parse_args(argv)
+
+    import_data.TSV_DIR = args.dir
+    backends = ["csv"] + (["arrow"] if import_data.arrow_parser else [])
+    if not import_data.arrow_parser:
+        print("pyarrow not installed — benchmarking the csv backend only.\n")
+
+    print(f"{'file':<26} {'parser':<7} {'rows':>12} {'seconds':>9} {'rows/s':>12} {'MB/s':>8}")
+    for step, spec in import_data.STEPS.items():
+        path = import_data.find_tsv(spec[0])
+        if not path:
+            continue
+        mb = path.stat().st_size / 1024 / 1024
+        for backend in backends:
+            seconds, rows = bench(step, path, backend, args.repeat)
+            print(f"{path.name:<26} {backend:<7} {rows:>12,} {seconds:>9.2f} "
+                  f"{rows / seconds:>12,.0f} {mb / seconds:>8.1f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Binary COPY Encoder
+===================
+Optional COPY format for import_data.py (--copy-format binary). Turns a
+whole chunk of COPY text lines into one PostgreSQL binary COPY payload, so
+the server receives ready-made int2/int4/numeric/bool datums instead of
+parsing text for every field.
+
+Input is exactly what the text path would send: tab-separated lines,
+\\N for NULL and COPY text escapes, which are decoded here the same way
+the server would decode them.
+
+This is a benchmarking option, not a speedup. The text is rendered first
+and then split and packed field by field in Python, under the GIL on the
+thread that feeds COPY. On the generated principals file that runs at
+about 160k rows/s, against about 1.1M rows/s for the arrow parser, so the
+client becomes the bottleneck long before the server's text parsing
+matters. bench_import.py --copy-format both measures the difference.
+"""
+
+import re
+import struct
+
+HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+TRAILER = struct.pack("!h", -1)
+NULL_FIELD = struct.pack("!i", -1)
+_length = struct.Struct("!i").pack
+
+_ESCAPE = re.compile(r"\\([0-7]{1,3}|x[0-9a-fA-F]{1,2}|.)")
+_ESCAPES = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+
+
+def _unescape(match):
+    esc = match.group(1)
+    if esc[0] in "01234567":
+        return chr(int(esc, 8))
+    if esc[0] == "x" and len(esc) > 1:
+        return chr(int(esc[1:], 16))
+    return _ESCAPES.get(esc, esc)
+
+
+def _text(val):
+    if b"\\" in val:
+        val = _ESCAPE.sub(_unescape, val.decode("utf-8")).encode("utf-8")
+    return _length(len(val)) + val
+
+
+def _int(fmt):
+    packer = struct.Struct(f"!i{fmt}")
+    size = packer.size - 4
+
+    def encode(val):
+        return packer.pack(size, int(val))
+    return encode
+
+
+_TRUE = b"\x00\x00\x00\x01\x01"
+_FALSE = b"\x00\x00\x00\x01\x00"
+
+
+def _bool(val):
+    return _TRUE if val.lower() in (b"t", b"true", b"1", b"y", b"yes", b"on") else _FALSE
+
+
+def _numeric(val):
+    """Decimal string → numeric wire format (base-10000 digits, weight, sign, scale)."""
+    val = val.decode("ascii")
+    sign = 0x4000 if val.startswith("-") else 0
+    whole, _, frac = val.lstrip("+-").partition(".")
+    whole = whole.lstrip("0")
+    scale = len(frac)
+    whole = "0" * (-len(whole) % 4) + whole
+    frac = frac + "0" * (-len(frac) % 4)
+    digits = [int(whole[i:i + 4]) for i in range(0, len(whole), 4)]
+    weight = len(digits) - 1
+    digits += [int(frac[i:i + 4]) for i in range(0, len(frac), 4)]
+    while digits and digits[-1] == 0:
+        digits.pop()
+    while digits and digits[0] == 0:
+        digits.pop(0)
+        weight -= 1
+    if not digits:
+        sign, weight = 0, 0
+    body = struct.pack(f"!hhhh{len(digits)}h", len(digits), weight, sign, scale, *digits)
+    return struct.pack("!i", len(body)) + body
+
+
+# pg_attribute.atttypid::regtype → field encoder
+ENCODERS = {
+    "smallint": _int("h"),
+    "integer": _int("i"),
+    "bigint": _int("q"),
+    "boolean": _bool,
+    "numeric": _numeric,
+    "text": _text,
+    "character varying": _text,
+    "character": _text,
+}
+
+
+def encoders(types):
+    """Field encoders for a list of column type names."""
+    missing = [t for t in types if t not in ENCODERS]
+    if missing:
+        raise ValueError(f"no binary COPY encoder for {', '.join(missing)}")
+    return [ENCODERS[t] for t in types]
+
+
+def encode(data, fields):
+    """
+    Encode UTF-8 COPY text lines (bytes) as one binary COPY payload, given
+    field encoders.
+    """
+    count = struct.pack("!h", len(fields))
+    out = [HEADER]
+    append = out.append
+    for line in data[:-1].split(b"\n") if data else ():
+        append(count)
+        for enc, val in zip(fields, line.split(b"\t")):
+            append(NULL_FIELD if val == b"\\N" else enc(val))
+    append(TRAILER)
+    return b"".join(out)
@@ -0,0 +1,204 @@
+"""
+Synthetic IMDb TSV Generator
+============================
+Writes title.basics, name.basics, title.ratings, title.principals and
+title.episode TSVs shaped like the IMDb dumps, so the importer can be
+measured at any size without downloading them. Output is deterministic for
+a given --scale and --seed.
+
+Usage:
+    python import/gen_tsv.py --out /tmp/imdb                # scale 1: 100k titles
+    python import/gen_tsv.py --out /tmp/imdb --scale 20 --gzip
+
+Per 100k titles at scale 1: ~130k people, ~15k ratings, ~500k principals
+and ~60k episodes, in the proportions of the real dumps. Rows are in ID
+order like the originals, IDs have gaps, and a share of principals and
+episodes point at missing people or series, so the FK-safe inserts have
+orphans to drop. Values include \\N, multi-genre lists, double quotes,
+non-ASCII text and episode numbers past SMALLINT range.
+"""
+
+import gzip
+import random
+import argparse
+from pathlib import Path
+
+TITLES_PER_SCALE = 100_000
+PEOPLE_PER_TITLE = 1.3
+
+# (titleType, weight), roughly as in title.basics
+TITLE_TYPES = [
+    ("tvEpisode", 60), ("short", 10), ("movie", 7), ("video", 3), ("tvSeries", 3),
+    ("tvMovie", 2), ("tvMiniSeries", 1), ("tvSpecial", 1), ("videoGame", 1), ("tvShort", 1),
+]
+
+GENRES = [
+    "Action", "Adult", "Adventure", "Animation", "Biography", "Comedy", "Crime",
+    "Documentary", "Drama", "Family", "Fantasy", "Film-Noir", "Game-Show", "History",
+    "Horror", "Music", "Musical", "Mystery", "News", "Reality-TV", "Romance",
+    "Sci-Fi", "Short", "Sport", "Talk-Show", "Thriller", "War", "Western",
+]
+
+CATEGORIES = [
+    ("actor", 30), ("actress", 20), ("self", 12), ("director", 10), ("writer", 10),
+    ("producer", 7), ("cinematographer", 3), ("composer", 3), ("editor", 3),
+    ("production_designer", 1), ("archive_footage", 1),
+]
+
+PROFESSIONS = ["actor", "actress", "director", "writer", "producer", "composer",
+               "cinematographer", "editor", "miscellaneous", "camera_department"]
+
+WORDS = [
+    "Night", "City", "Love", "Return", "Last", "Dark", "Star", "Road", "Blood", "Summer",
+    "Secret", "House", "Dream", "King", "Shadow", "River", "Fire", "Girl", "World", "Time",
+    "Amélie", "Straße", "Čas", "Noël", "東京", "Сердце", "Ángel", "Ødegaard",
+]
+
+FIRST_NAMES = ["John", "Mary", "José", "Anna", "Wei", "Olga", "Kenji", "Fatima",
+               "Lars", "Chloé", "Raj", "Zoë", "Miguel", "Ingrid", "Tomás", "Aiyana"]
+LAST_NAMES = ["Smith", "García", "Müller", "Kowalski", "Tanaka", "O'Brien", "Nguyen",
+              "Rossi", "Ivanova", "Björk", "Dubois", "Okafor", "Park", "Silva"]
+
+NULL = "\\N"
+
+
+def weighted(choices):
+    values, weights = zip(*choices)
+    return values, weights
+
+
+def open_out(path, compress):
+    if compress:
+        return gzip.open(f"{path}.gz", "wt", encoding="utf-8", compresslevel=1, newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def ids(rng, count):
+    """`count` increasing IDs with occasional gaps, like deleted IMDb entries."""
+    n = 0
+    for _ in range(count):
+        n += 1 if rng.random() > 0.01 else rng.randint(2, 10)
+        yield n
+
+
+def title_text(rng):
+    words = rng.sample(WORDS, rng.randint(1, 4))
+    text = " ".join(words)
+    roll = rng.random()
+    if roll < 0.02:
+        text = f'"{text}"'           # quoted titles: why the reader uses QUOTE_NONE
+    elif roll < 0.04:
+        text = f'The "{words[0]}" Affair'
+    elif roll < 0.06:
+        text = f"{text}: Part {rng.randint(2, 9)}"
+    return text
+
+
+def person_name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def gen_people(rng, out, count):
+    """Write name.basics; returns the largest nconst number."""
+    out.write("nconst\tprimaryName\tbirthYear\tdeathYear\tprimaryProfession\tknownForTitles\n")
+    last = 0
+    for n in ids(rng, count):
+        birth = rng.randint(1880, 2010) if rng.random() < 0.3 else None
+        death = birth + rng.randint(20, 95) if birth and rng.random() < 0.2 else None
+        professions = ",".join(rng.sample(PROFESSIONS, rng.randint(0, 3))) or NULL
+        known = ",".join(f"tt{rng.randint(1, 10_000_000):07d}" for _ in range(rng.randint(0, 4))) or NULL
+        name = person_name(rng) if rng.random() > 0.001 else NULL
+        out.write(f"nm{n:07d}\t{name}\t{birth or NULL}\t{death or NULL}\t{professions}\t{known}\n")
+        last = n
+    return last
+
+
+def gen_titles(rng, outs, count, max_person):
+    """Write title.basics with the ratings, principals and episodes of each title."""
+    basics, ratings, principals, episodes = outs
+    basics.write("tconst\ttitleType\tprimaryTitle\toriginalTitle\tisAdult\t"
+                 "startYear\tendYear\truntimeMinutes\tgenres\n")
+    ratings.write("tconst\taverageRating\tnumVotes\n")
+    principals.write("tconst\tordering\tnconst\tcategory\tjob\tcharacters\n")
+    episodes.write("tconst\tparentTconst\tseasonNumber\tepisodeNumber\n")
+
+    types, type_weights = weighted(TITLE_TYPES)
+    categories, category_weights = weighted(CATEGORIES)
+    series = []
+    for n in ids(rng, count):
+        tconst = f"tt{n:07d}"
+        title_type = rng.choices(types, type_weights)[0]
+        primary = title_text(rng)
+        original = primary if rng.random() < 0.85 else title_text(rng)
+        start = rng.randint(1890, 2026) if rng.random() < 0.9 else None
+        end = start + rng.randint(0, 15) if start and title_type in ("tvSeries", "tvMiniSeries") \
+            and rng.random() < 0.5 else None
+        runtime = rng.randint(1, 240) if rng.random() < 0.6 else None
+        genres = ",".join(rng.sample(GENRES, rng.choices((0, 1, 2, 3), (5, 45, 30, 20))[0])) or NULL
+        basics.write(f"{tconst}\t{title_type}\t{primary}\t{original}\t"
+                     f"{int(rng.random() < 0.02)}\t{start or NULL}\t{end or NULL}\t"
+                     f"{runtime or NULL}\t{genres}\n")
+
+        if title_type in ("tvSeries", "tvMiniSeries"):
+            series.append(tconst)
+        elif title_type == "tvEpisode" and series:
+            # ~2% of parents are missing, like episodes of deleted series
+            parent = rng.choice(series) if rng.random() > 0.02 else f"tt{n + 1_000_000_000}"
+            season = rng.randint(1, 30) if rng.random() < 0.8 else None
+            number = rng.randint(1, 40) if rng.random() < 0.995 else rng.randint(32_768, 99_999)
+            episodes.write(f"{tconst}\t{parent}\t{season or NULL}\t"
+                           f"{number if season else NULL}\n")
+
+        if rng.random() < 0.15:
+            ratings.write(f"{tconst}\t{rng.randint(10, 100) / 10}\t{int(rng.paretovariate(1.2) * 5)}\n")
+
+        for ordering in range(1, rng.choices((0, 2, 4, 8, 10), (10, 20, 30, 25, 15))[0] + 1):
+            # IDs past the last person, and gaps, are orphans for the FK filter
+            nconst = f"nm{rng.randint(1, int(max_person * 1.02)):07d}"
+            category = rng.choices(categories, category_weights)[0]
+            job = NULL
+            if category in ("writer", "producer") and rng.random() < 0.6:
+                job = rng.choice(["screenplay", "novel", "executive producer", "story by"])
+            characters = NULL
+            if category in ("actor", "actress", "self"):
+                characters = '["' + (person_name(rng) if category != "self" else "Self") + '"]'
+            principals.write(f"{tconst}\t{ordering}\t{nconst}\t{category}\t{job}\t{characters}\n")
+
+
+def generate(out_dir, scale=1.0, seed=42, compress=False):
+    """Write the five TSVs into `out_dir`. Returns {file name: path}."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    titles = max(1, int(TITLES_PER_SCALE * scale))
+    suffix = ".gz" if compress else ""
+
+    with open_out(out_dir / "name.basics.tsv", compress) as out:
+        max_person = gen_people(rng, out, int(titles * PEOPLE_PER_TITLE))
+
+    names = ("title.basics.tsv", "title.ratings.tsv", "title.principals.tsv", "title.episode.tsv")
+    outs = [open_out(out_dir / name, compress) for name in names]
+    try:
+        gen_titles(rng, outs, titles, max_person)
+    finally:
+        for out in outs:
+            out.close()
+
+    return {name: out_dir / f"{name}{suffix}" for name in ("name.basics.tsv",) + names}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic IMDb TSV dumps.")
+    parser.add_argument("--out", type=Path, required=True, help="output directory")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help=f"scale factor; 1 = {TITLES_PER_SCALE:,} titles")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--gzip", action="store_true", help="write .tsv.gz like the IMDb downloads")
+    args = parser.parse_args(argv)
+
+    for name, path in generate(args.out, args.scale, args.seed, args.gzip).items():
+        print(f"  {path}  ({path.stat().st_size / 1024 / 1024:,.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,66 @@
 """
 IMDb TSV Data Importer
 ======================
-Bulk-loads IMDb .tsv files into PostgreSQL using COPY via psycopg2.
+Bulk-loads IMDb .tsv / .tsv.gz files into PostgreSQL using COPY via psycopg2.
 Handles \\N → NULL conversion, genre normalization, and progress reporting.
+Rows are streamed to the server in bounded chunks (IMPORT_MEMORY_MB), so
+memory use stays flat regardless of file size.
 
 Usage:
-    python import_data.py
+    python import_data.py                 # sequential, one connection
+    python import_data.py --parallel      # one worker process per file range
+    python import_data.py --parallel --workers 8
+    python import_data.py --incremental   # apply only changes since last run
+    python import_data.py --resume        # continue an interrupted import
+    python import_data.py --parallel --defer-indexes   # rebuild indexes after load
+    python import_data.py --parallel --swap   # load a shadow schema, swap it live
+    python import_data.py --rollback          # swap the previous generation back
+    python import_data.py --copy-format binary   # benchmarking only: slower client, see binary_copy.py
+    python import_data.py --swap --optimize-layout   # CLUSTER + VACUUM ANALYZE after load
+    python import_data.py --progress --report run.json   # live progress, report path
 
 Expects .env file in project root with DB_HOST, DB_PORT, DB_USER, DB_PASS, DB_NAME.
 Expects TSV files in ../import/data/ relative to this script, OR specify TSV_DIR env var.
+Each file may be the IMDb download as-is (title.basics.tsv.gz) or decompressed.
+Every run writes a JSON report of per-stage throughput and timings to
+IMPORT_STATE_DIR/reports/ (or --report).
 """
 
 import os
 import sys
+import io
 import csv
+import gzip
+import json
+import hashlib
+import shutil
+import argparse
+import subprocess
 import time
+import queue
+import threading
 import psycopg2
+import psycopg2.errors
 from psycopg2 import sql
-from io import StringIO
+from collections import namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from dotenv import load_dotenv
 
+import binary_copy
+
+try:
+    import arrow_parser  # optional: needs pyarrow
+except ImportError:
+    arrow_parser = None
+
+try:
+    import resource  # peak RSS; not available on Windows
+except ImportError:
+    resource = None
+
 # ── Config ──────────────────────────────────────────────────────────────
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 load_dotenv(PROJECT_ROOT / ".env")
@@ -37,6 +77,29 @@ TSV_DIR = Path(os.getenv("TSV_DIR", PROJECT_ROOT.parent / "import" / "data"))
 
 BATCH_SIZE = 50_000  # rows per COPY batch
 
+# maintenance_work_mem for each index / FK rebuild connection (--defer-indexes).
+IMPORT_MAINTENANCE_MEM = os.getenv("IMPORT_MAINTENANCE_MEM", "1GB")
+
+# TSV parser backend: "arrow" (vectorized, needs pyarrow), "csv" (row by row)
+# or "auto" to use arrow when it is installed.
+IMPORT_PARSER = os.getenv("IMPORT_PARSER", "auto")
+
+# COPY wire format: "text", or "binary" for benchmarking only. Binary
+# re-encodes the rendered text in Python, which is several times slower on
+# the client than the text path saves on the server (see binary_copy.py).
+IMPORT_COPY_FORMAT = os.getenv("IMPORT_COPY_FORMAT", "text")
+
+# Block size handed to the vectorized parser.
+ARROW_BLOCK_BYTES = 16 * 1024 * 1024
+
+# Snapshot manifests for --incremental runs.
+IMPORT_STATE_DIR = Path(os.getenv("IMPORT_STATE_DIR", PROJECT_ROOT / "import" / "state"))
+
+# Ceiling for COPY data buffered client-side per connection. Rows are shipped
+# in chunks sized so that the chunk being filled, the one queued and the one
+# in flight together never exceed this budget.
+IMPORT_MEMORY_MB = int(os.getenv("IMPORT_MEMORY_MB", 256))
+
 
 def get_conn():
     return psycopg2.connect(**DB_CONFIG)
@@ -62,329 +125,1978 @@ def timer(label):
     return Timer()
 
 
-# ── Import Functions ────────────────────────────────────────────────────
+# ── Run Report ──────────────────────────────────────────────────────────
+# Per-stage counters and timings, saved as JSON after every run so runs can
+# be charted and compared. Time is split by where it went: parse_s is the
+# parser turning TSV into COPY data, copy_wait_s the parser sitting blocked
+# behind COPY (network or server bound), encode_s binary COPY encoding in
+# the background thread, server_s final inserts and commits. cpu_s close to
+# wall_s means the importer itself is the bottleneck.
+
+def peak_rss_mb():
+    """Peak RSS of this process or any of its worker processes, in MB."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    usage = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return round(usage / 1024, 1)
+
+
+class StageMetrics:
+    """Counters and timings of one import stage."""
+
+    COUNTERS = ("bytes_read", "rows_parsed", "rows_written", "rows_dropped",
+                "parse_s", "copy_wait_s", "encode_s", "server_s", "cpu_s")
+
+    def __init__(self, name):
+        self.name = name
+        for counter in self.COUNTERS:
+            setattr(self, counter, 0.0 if counter.endswith("_s") else 0)
+        self.wall_s = 0.0
+        self.peak_rss_mb = None
+        self.extra = {}
+        self._start = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def merge(self, other):
+        """Add the counters of another stage's metrics (e.g. from a worker)."""
+        for counter in self.COUNTERS:
+            setattr(self, counter, getattr(self, counter) + getattr(other, counter))
+
+    def done(self):
+        self.wall_s = self.elapsed()
+        self.cpu_s += time.process_time() - self._cpu
+        self.peak_rss_mb = peak_rss_mb()
+
+    def as_dict(self):
+        wall = self.wall_s or self.elapsed()
+        report = {"stage": self.name}
+        for counter in self.COUNTERS:
+            value = getattr(self, counter)
+            report[counter] = round(value, 3) if isinstance(value, float) else value
+        report.update({
+            "wall_s": round(wall, 3),
+            "rows_per_s": round(self.rows_parsed / wall) if wall else None,
+            "mb_per_s": round(self.bytes_read / 1024 / 1024 / wall, 1) if wall else None,
+            "peak_rss_mb": self.peak_rss_mb,
+        })
+        report.update(self.extra)
+        return report
+
+
+class ProgressLine:
+    """Rewrites one status line on stderr with a stage's live counters."""
+
+    def __init__(self, metrics, interval=1.0):
+        self.metrics = metrics
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            m = self.metrics
+            elapsed = m.elapsed()
+            mb = m.bytes_read / 1024 / 1024
+            sys.stderr.write(f"\r\x1b[K  ⋯ {m.name}: {m.rows_parsed:,} rows, {mb:,.0f} MB, "
+                             f"{m.rows_parsed / elapsed:,.0f} rows/s, {mb / elapsed:,.1f} MB/s, "
+                             f"peak RSS {peak_rss_mb()} MB")
+            sys.stderr.flush()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        sys.stderr.write("\r\x1b[K")
+        sys.stderr.flush()
+
+
+class RunReport:
+    """The stages of one run and its settings, saved as JSON by save()."""
+
+    def __init__(self, progress=False, **settings):
+        self.progress = progress
+        self.settings = settings
+        self.started = datetime.now(timezone.utc)
+        self.stages = []
+        self.status = "running"
 
-def import_titles(conn):
+    def add_stage(self, name):
+        metrics = StageMetrics(name)
+        self.stages.append(metrics)
+        return metrics
+
+    @contextmanager
+    def stage(self, name):
+        """Time a stage, showing a live progress line if enabled."""
+        metrics = self.add_stage(name)
+        ticker = ProgressLine(metrics) if self.progress else None
+        try:
+            yield metrics
+        finally:
+            if ticker:
+                ticker.stop()
+            metrics.done()
+
+    def save(self, path=None):
+        """Write the report; defaults to IMPORT_STATE_DIR/reports/. Returns the path."""
+        path = Path(path or IMPORT_STATE_DIR / "reports" / f"import-{self.started:%Y%m%d-%H%M%S}.json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        finished = datetime.now(timezone.utc)
+        path.write_text(json.dumps({
+            "started_at": self.started.isoformat(timespec="seconds"),
+            "finished_at": finished.isoformat(timespec="seconds"),
+            "status": self.status,
+            "wall_s": round((finished - self.started).total_seconds(), 3),
+            "peak_rss_mb": peak_rss_mb(),
+            "settings": self.settings,
+            "stages": [stage.as_dict() for stage in self.stages],
+        }, indent=2) + "\n", encoding="utf-8")
+        return path
+
+
+# ── Streaming COPY ──────────────────────────────────────────────────────
+
+class CopyBuffer:
     """
-    Import title.basics.tsv → title table + genre/title_genre tables.
-    
-    TSV columns: tconst, titleType, primaryTitle, originalTitle, isAdult,
-                 startYear, endYear, runtimeMinutes, genres
+    Row buffer for one target table inside a CopyStream.
+    Rows are COPY text lines (tab-separated, newline-terminated, \\N = NULL),
+    held UTF-8 encoded so the chunk size is counted in bytes.
     """
-    tsv_path = TSV_DIR / "title.basics.tsv"
-    if not tsv_path.exists():
-        print(f"  ⚠ {tsv_path} not found, skipping titles.")
-        return
 
-    cur = conn.cursor()
-    
-    # Collect genres and title-genre mappings
-    genres_set = set()
-    title_buf = StringIO()
-    genre_links = []  # (tconst, genre_name)
-    
-    with timer("Reading title.basics.tsv"):
-        with open(tsv_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
-            count = 0
-            for row in reader:
-                tconst = row["tconst"]
-                title_type = clean(row["titleType"])
-                primary_title = clean(row["primaryTitle"])
-                original_title = clean(row["originalTitle"])
-                is_adult = row["isAdult"] == "1"
-                start_year = clean(row["startYear"])
-                end_year = clean(row["endYear"])
-                runtime = clean(row["runtimeMinutes"])
-                genres_raw = clean(row["genres"])
-
-                # Write to COPY buffer: tconst, title_type, primary_title, original_title, is_adult, start_year, end_year, runtime_minutes
-                line = "\t".join([
-                    tconst,
-                    title_type or "\\N",
-                    (primary_title or "\\N").replace("\t", " ").replace("\n", " "),
-                    (original_title or "\\N").replace("\t", " ").replace("\n", " "),
-                    "t" if is_adult else "f",
-                    start_year if start_year else "\\N",
-                    end_year if end_year else "\\N",
-                    runtime if runtime else "\\N",
-                ])
-                title_buf.write(line + "\n")
-
-                # Collect genres
-                if genres_raw:
-                    for g in genres_raw.split(","):
-                        g = g.strip()
-                        if g:
-                            genres_set.add(g)
-                            genre_links.append((tconst, g))
-                
-                count += 1
-                if count % 500_000 == 0:
-                    print(f"    read {count:,} titles...", flush=True)
-
-    with timer(f"COPY {count:,} titles into title table"):
-        title_buf.seek(0)
-        cur.copy_from(
-            title_buf, "title",
-            columns=("tconst", "title_type", "primary_title", "original_title",
-                     "is_adult", "start_year", "end_year", "runtime_minutes"),
-            null="\\N"
-        )
-        conn.commit()
+    def __init__(self, stream, table, columns):
+        self.stream = stream
+        self.table = table
+        self.columns = columns
+        self.rows = 0
+        self._buf = io.BytesIO()
 
-    # Insert genres
-    with timer(f"Inserting {len(genres_set)} genres"):
-        for g in sorted(genres_set):
-            cur.execute(
-                "INSERT INTO genre(name) VALUES (%s) ON CONFLICT(name) DO NOTHING",
-                (g,)
-            )
-        conn.commit()
+    def write(self, line):
+        self._buf.write(line.encode("utf-8"))
+        self.rows += 1
+        if self._buf.tell() >= self.stream.chunk_bytes:
+            self.flush()
 
-    # Build genre_id lookup
-    cur.execute("SELECT name, genre_id FROM genre")
-    genre_map = dict(cur.fetchall())
-
-    # Insert title_genre links
-    with timer(f"COPY {len(genre_links):,} title-genre links"):
-        tg_buf = StringIO()
-        for tconst, gname in genre_links:
-            gid = genre_map.get(gname)
-            if gid:
-                tg_buf.write(f"{tconst}\t{gid}\n")
-        tg_buf.seek(0)
-        cur.copy_from(tg_buf, "title_genre", columns=("tconst", "genre_id"))
-        conn.commit()
+    def write_block(self, text, rows):
+        """Append `rows` pre-rendered COPY lines at once."""
+        self._buf.write(text.encode("utf-8"))
+        self.rows += rows
+        if self._buf.tell() >= self.stream.chunk_bytes:
+            self.flush()
 
-    cur.close()
-    print(f"  ✓ Imported {count:,} titles, {len(genres_set)} genres, {len(genre_links):,} genre links.")
+    def flush(self):
+        if self._buf.tell() == 0:
+            return
+        buf, self._buf = self._buf, io.BytesIO()
+        buf.seek(0)
+        self.stream._submit(self.table, self.columns, buf)
 
 
-def import_ratings(conn):
+class CopyStream:
     """
-    Import title.ratings.tsv → rating table.
-    
-    TSV columns: tconst, averageRating, numVotes
-    Only imports ratings for titles that exist in the title table.
+    Streams COPY data to one connection in bounded chunks.
+
+    Each registered table gets its own CopyBuffer. Full chunks are handed to a
+    background thread that runs the COPY while the caller keeps parsing, so
+    file parsing overlaps with server-side ingestion. Only one chunk may be
+    queued behind the one in flight; together with the buffers being filled
+    this keeps client memory under IMPORT_MEMORY_MB regardless of file size.
+
+    With copy_format "binary" (a benchmarking option, see binary_copy.py)
+    the background thread encodes each chunk into binary COPY format just
+    before sending it, using the column types of the target table; that
+    chunk is briefly held in both forms, so the budget reserves a slot for
+    the second copy.
+
+    `wait_s` is the time callers spent blocked on the COPY thread and
+    `encode_s` the time that thread spent on binary encoding.
+
+    All chunks share the caller's transaction; nothing is committed here.
+    The COPY thread is stopped on every exit path, including errors.
     """
-    tsv_path = TSV_DIR / "title.ratings.tsv"
-    if not tsv_path.exists():
-        print(f"  ⚠ {tsv_path} not found, skipping ratings.")
+
+    def __init__(self, conn, memory_mb=None, copy_format=None):
+        self.conn = conn
+        self.memory_bytes = (memory_mb or IMPORT_MEMORY_MB) * 1024 * 1024
+        self.binary = (copy_format or IMPORT_COPY_FORMAT) == "binary"
+        self.buffers = []
+        self.chunk_bytes = self._chunk_bytes()
+        self._fields = {}
+        self.wait_s = 0.0
+        self.encode_s = 0.0
+        self._queue = queue.Queue(maxsize=1)
+        self._error = None
+        self._aborted = False
+        self._stopped = False
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def _chunk_bytes(self):
+        # filling buffers + one queued + one in flight (+ its binary form) share the budget
+        return self.memory_bytes // (len(self.buffers) + 2 + self.binary)
+
+    def table(self, table, columns):
+        """Register a target table and return its CopyBuffer."""
+        buf = CopyBuffer(self, table, columns)
+        self.buffers.append(buf)
+        self.chunk_bytes = self._chunk_bytes()
+        return buf
+
+    @property
+    def rows(self):
+        """Rows handed to COPY so far, over all tables."""
+        return sum(buf.rows for buf in self.buffers)
+
+    def _submit(self, table, columns, buf):
+        if self._error:
+            raise self._error
+        start = time.perf_counter()
+        self._queue.put((table, columns, buf))
+        self.wait_s += time.perf_counter() - start
+
+    def _drain(self):
+        cur = self.conn.cursor()
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    break
+                if self._error or self._aborted:
+                    continue  # keep draining so producers never block
+                table, columns, buf = job
+                try:
+                    if self.binary:
+                        start = time.perf_counter()
+                        buf = io.BytesIO(binary_copy.encode(buf.getvalue(),
+                                                            self._encoders(cur, table, columns)))
+                        self.encode_s += time.perf_counter() - start
+                    cur.copy_expert(copy_sql(table, columns, self.binary), buf)
+                except Exception as e:
+                    self._error = e
+        finally:
+            cur.close()
+
+    def _encoders(self, cur, table, columns):
+        """Binary field encoders for `columns`, from the table's catalog types."""
+        if (table, columns) not in self._fields:
+            cur.execute("""
+                SELECT attname, atttypid::regtype::text FROM pg_attribute
+                WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+            """, (table,))
+            types = dict(cur.fetchall())
+            self._fields[table, columns] = binary_copy.encoders([types[c] for c in columns])
+        return self._fields[table, columns]
+
+    def _stop(self):
+        """Queue the end marker and wait for the COPY thread to exit (once)."""
+        if self._stopped:
+            return
+        self._stopped = True
+        start = time.perf_counter()
+        self._queue.put(None)
+        self._thread.join()
+        self.wait_s += time.perf_counter() - start
+
+    def close(self):
+        """Flush remaining rows and wait for every chunk to reach the server."""
+        try:
+            for buf in self.buffers:
+                if not self._error:
+                    buf.flush()
+        finally:
+            self._stop()
+        if self._error:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is None:
+            self.close()
+        else:
+            # Abandon pending chunks; the caller rolls the transaction back.
+            self._aborted = True
+            self._stop()
+
+
+def copy_sql(table, columns, binary=False):
+    """COPY … FROM STDIN statement for a (possibly schema-qualified) table."""
+    options = "FORMAT binary" if binary else "FORMAT text, NULL '\\N'"
+    return sql.SQL("COPY {} ({}) FROM STDIN WITH (" + options + ")").format(
+        sql.Identifier(*table.split(".")),
+        sql.SQL(", ").join(map(sql.Identifier, columns)),
+    )
+
+
+def no_tabs(val):
+    """Make a cleaned text value safe for a COPY text line."""
+    if val is None:
+        return "\\N"
+    return val.replace("\t", " ").replace("\n", " ")
+
+
+# ── TSV Reading ─────────────────────────────────────────────────────────
+
+# Files smaller than this are never split across parallel workers.
+MIN_RANGE_BYTES = 64 * 1024 * 1024
+
+# Read size for the pipe between the gzip decompressor and the parser.
+GZIP_PIPE_BYTES = 1024 * 1024
+
+
+def find_tsv(name):
+    """
+    Locate an IMDb dump in TSV_DIR, as published (name.gz) or decompressed.
+    The plain file wins when both exist since it can be split into ranges.
+    """
+    for path in (TSV_DIR / name, TSV_DIR / f"{name}.gz"):
+        if path.exists():
+            return path
+    return None
+
+
+@contextmanager
+def open_tsv(path):
+    """
+    Open a .tsv or .tsv.gz file for binary reading.
+
+    Compressed files are inflated outside the parsing thread so decompression
+    overlaps with parsing and COPY: by a pigz/gzip child process when one is
+    on PATH, otherwise by a thread writing into a pipe (zlib releases the GIL).
+    """
+    path = Path(path)
+    if path.suffix != ".gz":
+        with open(path, "rb") as f:
+            yield f
         return
 
-    cur = conn.cursor()
+    gunzip = shutil.which("pigz") or shutil.which("gzip")
+    if gunzip:
+        proc = subprocess.Popen([gunzip, "-dc", str(path)], stdout=subprocess.PIPE,
+                                bufsize=GZIP_PIPE_BYTES)
+        try:
+            yield proc.stdout
+        except BaseException:
+            proc.kill()
+            raise
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+        if returncode != 0:
+            raise RuntimeError(f"{gunzip} exited with status {returncode} on {path}")
+        return
 
-    buf = StringIO()
-    count = 0
-    with timer("Reading title.ratings.tsv"):
-        with open(tsv_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
-            for row in reader:
-                tconst = row["tconst"]
-                avg_rating = clean(row["averageRating"])
-                num_votes = clean(row["numVotes"])
-                if avg_rating and num_votes:
-                    buf.write(f"{tconst}\t{avg_rating}\t{num_votes}\n")
-                    count += 1
-
-    with timer(f"COPY {count:,} ratings"):
-        buf.seek(0)
-        # Use a temp table approach to skip ratings for non-existent titles
-        cur.execute("""
-            CREATE TEMP TABLE tmp_rating (
-                tconst VARCHAR(12),
-                average_rating NUMERIC(3,1),
-                num_votes INTEGER
-            ) ON COMMIT DROP
-        """)
-        cur.copy_from(buf, "tmp_rating", columns=("tconst", "average_rating", "num_votes"))
-        cur.execute("""
-            INSERT INTO rating (tconst, average_rating, num_votes)
-            SELECT t.tconst, tr.average_rating, tr.num_votes
-            FROM tmp_rating tr
-            JOIN title t ON t.tconst = tr.tconst
-            ON CONFLICT (tconst) DO UPDATE SET
-                average_rating = EXCLUDED.average_rating,
-                num_votes = EXCLUDED.num_votes
-        """)
-        conn.commit()
+    errors = []
+    r, w = os.pipe()
 
-    cur.close()
-    print(f"  ✓ Imported {count:,} ratings.")
+    def pump():
+        try:
+            with gzip.open(path, "rb") as src, open(w, "wb") as dst:
+                shutil.copyfileobj(src, dst, GZIP_PIPE_BYTES)
+        except BrokenPipeError:
+            pass  # reader stopped early
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=pump, daemon=True)
+    thread.start()
+    with open(r, "rb", buffering=GZIP_PIPE_BYTES) as f:
+        yield f
+    thread.join()
+    if errors:
+        raise errors[0]
+
+
+class _RangeReader(io.RawIOBase):
+    """
+    Raw reader exposing at most `limit` bytes of `f` (None = until EOF),
+    starting at byte `offset` of the (decompressed) file. Bytes and lines
+    read are added to `metrics` (a StageMetrics) as they go.
+    """
+
+    def __init__(self, f, limit, offset=0, metrics=None):
+        self.f = f
+        self.left = limit
+        self.offset = offset
+        self.metrics = metrics
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        n = len(b) if self.left is None else min(len(b), self.left)
+        data = self.f.read(n)
+        b[:len(data)] = data
+        if self.left is not None:
+            self.left -= len(data)
+        if self.metrics:
+            self.metrics.bytes_read += len(data)
+            self.metrics.rows_parsed += data.count(b"\n")
+        return len(data)
+
+
+@contextmanager
+def open_range(path, start=0, end=None, metrics=None):
+    """
+    Open the data lines of a TSV file (plain or .gz) whose first byte lies in
+    [start, end), so adjacent byte ranges from split_ranges() cover every
+    data line exactly once. Yields (header columns, binary file); reads are
+    counted into `metrics` if given.
+
+    A .gz file cannot be seeked: its `start` counts decompressed bytes, which
+    are read and discarded, and `end` must be None.
+    """
+    with open_tsv(path) as f:
+        first = f.readline()
+        header = first.decode("utf-8").rstrip("\r\n").split("\t")
+        pos = len(first)  # pipes from a decompressor cannot tell()
+        if start > pos:
+            if f.seekable():
+                f.seek(start - 1)
+            else:
+                while pos < start - 1:
+                    skipped = f.read(min(GZIP_PIPE_BYTES, start - 1 - pos))
+                    if not skipped:
+                        break
+                    pos += len(skipped)
+            pos = start - 1 + len(f.readline())
+        limit = None
+        if end is not None:
+            limit = 0
+            if end > pos:
+                f.seek(end - 1)
+                f.readline()  # the line holding byte end-1 starts in range
+                limit = f.tell() - pos
+                f.seek(pos)
+        yield header, io.BufferedReader(_RangeReader(f, limit, pos, metrics), GZIP_PIPE_BYTES)
 
 
-def import_people(conn):
+class _ChunkReader(io.RawIOBase):
+    """
+    Raw reader over buffered file `f` that stops at the first line boundary
+    at or after `size` bytes. `consumed` counts the bytes it has served.
     """
-    Import name.basics.tsv → person table.
-    
+
+    def __init__(self, f, size):
+        self.f = f
+        self.left = size
+        self.tail = b""
+        self.consumed = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self.left > 0:
+            data = self.f.read(min(len(b), self.left))
+            self.left = self.left - len(data) if data else 0
+            if self.left == 0 and data and not data.endswith(b"\n"):
+                self.tail = self.f.readline()  # finish the line we are in
+        else:
+            data, self.tail = self.tail[:len(b)], self.tail[len(b):]
+        b[:len(data)] = data
+        self.consumed += len(data)
+        return len(data)
+
+
+def read_chunks(f, size):
+    """
+    Split the rest of binary file `f` into consecutive chunks of about `size`
+    bytes, each ending on a line boundary. Yields a _ChunkReader per chunk;
+    each must be read to EOF before the next one is taken.
+    """
+    while f.peek(1):
+        yield _ChunkReader(f, size)
+
+
+def resolve_parser(name):
+    """Map a --parser choice to the backend that will actually run."""
+    if name == "auto":
+        return "arrow" if arrow_parser else "csv"
+    if name == "arrow" and not arrow_parser:
+        raise RuntimeError("--parser arrow needs pyarrow (pip install pyarrow)")
+    return name
+
+
+def parse_file(step, path, stream, staging, start=0, end=None, parser=None, metrics=None):
+    """
+    Parse a TSV (or one byte range of it) for `step` into `stream` with the
+    chosen backend. Returns the row count of the step's main table.
+    """
+    with open_range(path, start, end, metrics) as (header, f):
+        return parse_stream(step, header, f, stream, staging, parser, metrics=metrics)
+
+
+def parse_stream(step, header, f, stream, staging, parser=None, key_filter=None, metrics=None):
+    """
+    Like parse_file, for TSV data lines read from binary file `f`. Rows
+    failing `key_filter` (a KeyFilter) are dropped before they are written.
+    The arrow backend skips lines with the wrong number of fields (csv pads
+    or keeps them); those are counted into metrics.rows_dropped and printed.
+    """
+    parser = resolve_parser(parser or IMPORT_PARSER)
+    if parser == "csv":
+        if key_filter:
+            stream = KeyFilterStream(stream, key_filter)
+        lines = (line.decode("utf-8") for line in f)
+        rows = csv.DictReader(lines, fieldnames=header, delimiter="\t", quoting=csv.QUOTE_NONE)
+        return STEPS[step][1](rows, stream, staging)
+
+    def skipped(count):
+        print(f"  ⚠ {count:,} malformed {step} lines skipped (wrong field count)")
+        if metrics:
+            metrics.rows_dropped += count
+
+    return arrow_parser.copy_layouts(f, header, LAYOUTS[step], stream, staging, ARROW_BLOCK_BYTES,
+                                     keep=key_filter.mask if key_filter else None, on_skip=skipped)
+
+
+def split_ranges(path, parts):
+    """
+    Split a file into at most `parts` byte ranges of ≥ MIN_RANGE_BYTES each.
+    Compressed files cannot be seeked into and always form a single range.
+    """
+    if Path(path).suffix == ".gz":
+        return [(0, None)]
+    size = Path(path).stat().st_size
+    parts = max(1, min(parts, size // MIN_RANGE_BYTES))
+    step = -(-size // parts)
+    return [(i * step, min(size, (i + 1) * step)) for i in range(parts)]
+
+
+# ── Staging Tables ──────────────────────────────────────────────────────
+
+# Raw rows land here first when the final insert must be FK-filtered
+# (or, for --incremental, when it must be merged into existing rows).
+STAGING_COLUMNS = {
+    "title": """
+        tconst VARCHAR(12),
+        title_type VARCHAR(20),
+        primary_title TEXT,
+        original_title TEXT,
+        is_adult BOOLEAN,
+        start_year SMALLINT,
+        end_year SMALLINT,
+        runtime_minutes INTEGER
+    """,
+    "person": """
+        nconst VARCHAR(12),
+        primary_name TEXT,
+        birth_year SMALLINT,
+        death_year SMALLINT
+    """,
+    # one row per title: the raw comma-separated genres column
+    "title_genre": """
+        tconst VARCHAR(12),
+        genres TEXT
+    """,
+    "rating": """
+        tconst VARCHAR(12),
+        average_rating NUMERIC(3,1),
+        num_votes INTEGER
+    """,
+    "principal": """
+        tconst VARCHAR(12),
+        ordering SMALLINT,
+        nconst VARCHAR(12),
+        category VARCHAR(30),
+        job TEXT,
+        characters TEXT
+    """,
+    # INTEGER here: a few daily shows number episodes past SMALLINT range
+    "episode": """
+        tconst VARCHAR(12),
+        parent_tconst VARCHAR(12),
+        season_number INTEGER,
+        episode_number INTEGER
+    """,
+}
+
+# step → staging needed by a full import; title and person rows go straight in.
+FULL_STAGING = {
+    "titles":     ("title_genre",),
+    "people":     (),
+    "ratings":    ("rating",),
+    "principals": ("principal",),
+    "episodes":   ("episode",),
+}
+FK_STAGING = tuple(kind for kinds in FULL_STAGING.values() for kind in kinds)
+
+
+def create_staging(cur, kind, shared=False):
+    """
+    Create a staging table and return its name.
+
+    Sequential imports use session temp tables (tmp_*) dropped on commit.
+    Parallel imports need tables visible to every worker connection, so they
+    use UNLOGGED stg_* tables that the coordinator drops when it is done.
+    """
+    if shared:
+        name = f"stg_{kind}"
+        cur.execute(f"DROP TABLE IF EXISTS {name}")
+        cur.execute(f"CREATE UNLOGGED TABLE {name} ({STAGING_COLUMNS[kind]})")
+    else:
+        name = f"tmp_{kind}"
+        cur.execute(f"CREATE TEMP TABLE {name} ({STAGING_COLUMNS[kind]}) ON COMMIT DROP")
+    return name
+
+
+# ── Parse Steps ─────────────────────────────────────────────────────────
+# Each copy_* function streams parsed rows into a CopyStream and returns the
+# number of rows read. Rows without FK dependencies go straight to their
+# final table unless `staging` names one for them; the rest go to the
+# staging table named in `staging`.
+
+def copy_titles(rows, stream, staging):
+    """
+    title.basics → title, plus (tconst, raw genres) → staging title_genre.
+
+    TSV columns: tconst, titleType, primaryTitle, originalTitle, isAdult,
+                 startYear, endYear, runtimeMinutes, genres
+    """
+    titles = stream.table(staging.get("title", "title"), (
+        "tconst", "title_type", "primary_title", "original_title",
+        "is_adult", "start_year", "end_year", "runtime_minutes"))
+    genres = stream.table(staging["title_genre"], ("tconst", "genres"))
+
+    for row in rows:
+        tconst = row["tconst"]
+        genres_raw = clean(row["genres"])
+
+        # tconst, title_type, primary_title, original_title, is_adult, start_year, end_year, runtime_minutes
+        titles.write("\t".join([
+            tconst,
+            clean(row["titleType"]) or "\\N",
+            no_tabs(clean(row["primaryTitle"])),
+            no_tabs(clean(row["originalTitle"])),
+            "t" if row["isAdult"] == "1" else "f",
+            clean(row["startYear"]) or "\\N",
+            clean(row["endYear"]) or "\\N",
+            clean(row["runtimeMinutes"]) or "\\N",
+        ]) + "\n")
+
+        if genres_raw:
+            genres.write(f"{tconst}\t{genres_raw}\n")
+
+    return titles.rows
+
+
+def copy_people(rows, stream, staging):
+    """
+    name.basics → person.
+
     TSV columns: nconst, primaryName, birthYear, deathYear, primaryProfession, knownForTitles
     We only import nconst, primaryName, birthYear, deathYear.
     """
-    tsv_path = TSV_DIR / "name.basics.tsv"
-    if not tsv_path.exists():
-        print(f"  ⚠ {tsv_path} not found, skipping people.")
-        return
+    buf = stream.table(staging.get("person", "person"), ("nconst", "primary_name", "birth_year", "death_year"))
+    for row in rows:
+        nconst = row["nconst"]
+        name = no_tabs(clean(row["primaryName"]) or "Unknown")
+        birth = clean(row["birthYear"]) or "\\N"
+        death = clean(row["deathYear"]) or "\\N"
+        buf.write(f"{nconst}\t{name}\t{birth}\t{death}\n")
+    return buf.rows
+
+
+def copy_ratings(rows, stream, staging):
+    """
+    title.ratings → staging rating.
+
+    TSV columns: tconst, averageRating, numVotes
+    """
+    buf = stream.table(staging["rating"], ("tconst", "average_rating", "num_votes"))
+    for row in rows:
+        avg_rating = clean(row["averageRating"])
+        num_votes = clean(row["numVotes"])
+        if avg_rating and num_votes:
+            buf.write(f"{row['tconst']}\t{avg_rating}\t{num_votes}\n")
+    return buf.rows
+
+
+def copy_principals(rows, stream, staging):
+    """
+    title.principals → principal, or staging principal when the final insert
+    filters FK orphans server-side.
+
+    TSV columns: tconst, ordering, nconst, category, job, characters
+    """
+    buf = stream.table(staging.get("principal", "principal"),
+                       ("tconst", "ordering", "nconst", "category", "job", "characters"))
+    for row in rows:
+        buf.write("\t".join([
+            row["tconst"], row["ordering"], row["nconst"],
+            clean(row["category"]) or "unknown",
+            no_tabs(clean(row["job"])),
+            no_tabs(clean(row["characters"])),
+        ]) + "\n")
+    return buf.rows
+
+
+def copy_episodes(rows, stream, staging):
+    """
+    title.episode → staging episode.
+
+    TSV columns: tconst, parentTconst, seasonNumber, episodeNumber
+    """
+    buf = stream.table(staging["episode"],
+                       ("tconst", "parent_tconst", "season_number", "episode_number"))
+    for row in rows:
+        buf.write("\t".join([
+            row["tconst"], row["parentTconst"],
+            clean(row["seasonNumber"]) or "\\N",
+            clean(row["episodeNumber"]) or "\\N",
+        ]) + "\n")
+    return buf.rows
+
+
+# ── Final Inserts ───────────────────────────────────────────────────────
+# Set-based moves from staging into the FK-constrained tables.
+
+def finish_titles(cur, staging):
+    """
+    Explode the staged genre lists server-side into genre and title_genre
+    in a single statement. Returns (new genres, links).
+
+    Genres created by this statement are not visible to its own snapshot,
+    so their ids come from the RETURNING rows of the genre insert.
+    """
+    cur.execute(sql.SQL("""
+        WITH links AS (
+            SELECT DISTINCT s.tconst, btrim(g.name) AS name
+            FROM {} s
+            CROSS JOIN LATERAL unnest(string_to_array(s.genres, ',')) AS g(name)
+            WHERE btrim(g.name) <> ''
+        ), new_genres AS (
+            INSERT INTO genre (name)
+            SELECT DISTINCT name FROM links
+            ORDER BY name
+            ON CONFLICT (name) DO NOTHING
+            RETURNING genre_id, name
+        ), new_links AS (
+            INSERT INTO title_genre (tconst, genre_id)
+            SELECT l.tconst, COALESCE(n.genre_id, g.genre_id)
+            FROM links l
+            LEFT JOIN new_genres n ON n.name = l.name
+            LEFT JOIN genre g ON g.name = l.name
+            ON CONFLICT DO NOTHING
+            RETURNING 1
+        )
+        SELECT (SELECT count(*) FROM new_genres), (SELECT count(*) FROM new_links)
+    """).format(sql.Identifier(staging["title_genre"])))
+    return cur.fetchone()
+
+
+def finish_ratings(cur, staging):
+    """Insert staged ratings for titles that exist. Returns rows inserted."""
+    cur.execute(sql.SQL("""
+        INSERT INTO rating (tconst, average_rating, num_votes)
+        SELECT t.tconst, tr.average_rating, tr.num_votes
+        FROM {} tr
+        JOIN title t ON t.tconst = tr.tconst
+        ON CONFLICT (tconst) DO UPDATE SET
+            average_rating = EXCLUDED.average_rating,
+            num_votes = EXCLUDED.num_votes
+    """).format(sql.Identifier(staging["rating"])))
+    return cur.rowcount
+
+
+def finish_principals(cur, staging):
+    """Insert staged principals whose title and person exist. Returns rows inserted."""
+    cur.execute(sql.SQL("""
+        INSERT INTO principal (tconst, ordering, nconst, category, job, characters)
+        SELECT tp.tconst, tp.ordering, tp.nconst, tp.category, tp.job, tp.characters
+        FROM {} tp
+        WHERE EXISTS (SELECT 1 FROM title t WHERE t.tconst = tp.tconst)
+          AND EXISTS (SELECT 1 FROM person p WHERE p.nconst = tp.nconst)
+        ON CONFLICT (tconst, ordering) DO UPDATE SET
+            nconst = EXCLUDED.nconst,
+            category = EXCLUDED.category,
+            job = EXCLUDED.job,
+            characters = EXCLUDED.characters
+    """).format(sql.Identifier(staging["principal"])))
+    return cur.rowcount
+
+
+def finish_episodes(cur, staging):
+    """Insert staged episodes whose episode and parent titles exist. Returns rows inserted."""
+    cur.execute(sql.SQL("""
+        INSERT INTO episode (tconst, parent_tconst, season_number, episode_number)
+        SELECT te.tconst, te.parent_tconst,
+               CASE WHEN te.season_number BETWEEN 0 AND 32767 THEN te.season_number END,
+               CASE WHEN te.episode_number BETWEEN 0 AND 32767 THEN te.episode_number END
+        FROM {} te
+        WHERE EXISTS (SELECT 1 FROM title t WHERE t.tconst = te.tconst)
+          AND EXISTS (SELECT 1 FROM title p WHERE p.tconst = te.parent_tconst)
+        ON CONFLICT (tconst) DO UPDATE SET
+            parent_tconst = EXCLUDED.parent_tconst,
+            season_number = EXCLUDED.season_number,
+            episode_number = EXCLUDED.episode_number
+    """).format(sql.Identifier(staging["episode"])))
+    return cur.rowcount
+
+
+# step → (TSV file, parse function, final insert, steps whose rows it joins against)
+STEPS = {
+    "titles":     ("title.basics.tsv",     copy_titles,     finish_titles,     ("titles",)),
+    "people":     ("name.basics.tsv",      copy_people,     None,              ()),
+    "ratings":    ("title.ratings.tsv",    copy_ratings,    finish_ratings,    ("titles",)),
+    "principals": ("title.principals.tsv", copy_principals, finish_principals, ("titles", "people")),
+    "episodes":   ("title.episode.tsv",    copy_episodes,   finish_episodes,   ("titles",)),
+}
+
+
+# One COPY target of a parse step, for the vectorized parser.
+#   target    staging kind; resolved through `staging`, else used as table name
+#   columns   (COPY column, TSV column, transform) triples. transform is None
+#             (value as-is, NULL stays \N), "bool" ("1" → t, else f) or a
+#             default string used in place of NULL
+#   required  TSV columns that must be non-NULL for a row to be kept
+Layout = namedtuple("Layout", "target columns required", defaults=((),))
+
+# The same steps, described column-wise. Each layout must produce exactly
+# the lines its copy_* counterpart writes.
+LAYOUTS = {
+    "titles": (
+        Layout("title", (
+            ("tconst", "tconst", None),
+            ("title_type", "titleType", None),
+            ("primary_title", "primaryTitle", None),
+            ("original_title", "originalTitle", None),
+            ("is_adult", "isAdult", "bool"),
+            ("start_year", "startYear", None),
+            ("end_year", "endYear", None),
+            ("runtime_minutes", "runtimeMinutes", None),
+        )),
+        Layout("title_genre", (("tconst", "tconst", None), ("genres", "genres", None)),
+               required=("genres",)),
+    ),
+    "people": (
+        Layout("person", (
+            ("nconst", "nconst", None),
+            ("primary_name", "primaryName", "Unknown"),
+            ("birth_year", "birthYear", None),
+            ("death_year", "deathYear", None),
+        )),
+    ),
+    "ratings": (
+        Layout("rating", (
+            ("tconst", "tconst", None),
+            ("average_rating", "averageRating", None),
+            ("num_votes", "numVotes", None),
+        ), required=("averageRating", "numVotes")),
+    ),
+    "principals": (
+        Layout("principal", (
+            ("tconst", "tconst", None),
+            ("ordering", "ordering", None),
+            ("nconst", "nconst", None),
+            ("category", "category", "unknown"),
+            ("job", "job", None),
+            ("characters", "characters", None),
+        )),
+    ),
+    "episodes": (
+        Layout("episode", (
+            ("tconst", "tconst", None),
+            ("parent_tconst", "parentTconst", None),
+            ("season_number", "seasonNumber", None),
+            ("episode_number", "episodeNumber", None),
+        )),
+    ),
+}
+
+
+# ── FK Pre-filtering ────────────────────────────────────────────────────
+# A sequential import has loaded titles and people before it reads
+# principals, so their keys can be checked client-side: orphan rows are
+# dropped before they are sent, and principals are COPYed straight into
+# their table instead of through staging and an INSERT … WHERE EXISTS.
+# IMDb IDs are a two-letter prefix and a number, so each key set is a
+# bitmap over the numbers: ~4 MB for every tconst in the current dumps.
+
+# step → (key column, table it must exist in, ID prefix), checked client-side.
+# The column has the same name in the TSV, the COPY lines and the table.
+PREFILTER = {
+    "principals": (("tconst", "title", "tt"), ("nconst", "person", "nm")),
+}
+
+# Longest ID number held in a bitmap (at most 125 MB); longer or otherwise
+# unusual keys go to the KeySet's plain set instead.
+KEY_DIGITS = 9
+
+
+class KeySet:
+    """
+    Set of IMDb IDs with one prefix: a bitmap over the numeric part (bit
+    n & 7 of byte n >> 3, as in Arrow boolean arrays) plus a plain set for
+    the rare key that does not follow the pattern.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.bits = bytearray()
+        self.other = set()
+
+    def __contains__(self, key):
+        digits = key[2:]
+        if key[:2] != self.prefix or not 0 < len(digits) <= KEY_DIGITS \
+                or not (digits.isascii() and digits.isdigit()):
+            return key in self.other
+        n = int(digits)
+        return n >> 3 < len(self.bits) and self.bits[n >> 3] >> (n & 7) & 1 == 1
+
+    @classmethod
+    def load(cls, cur, table, column, prefix):
+        """
+        Read every key of `table`. The server packs numeric IDs into
+        (byte index, byte) pairs, so at most one line per 8 IDs is sent.
+        """
+        keys = cls(prefix)
+        params = {"column": sql.Identifier(column), "table": sql.Identifier(table),
+                  "pattern": sql.Literal(f"^{prefix}[0-9]{{1,{KEY_DIGITS}}}$")}
+        bits = keys.bits
+        tail = [b""]
+
+        class Sink:
+            def write(self, data):
+                lines = (tail[0] + data).split(b"\n")
+                tail[0] = lines.pop()
+                for line in lines:
+                    i, byte = map(int, line.split(b"\t"))
+                    if i >= len(bits):
+                        bits.extend(bytes(max(len(bits), i + 1 - len(bits))))
+                    bits[i] = byte
+
+        cur.copy_expert(sql.SQL("""
+            COPY (
+                SELECT n >> 3, bit_or(1 << (n & 7))
+                FROM (SELECT substr({column}, 3)::int AS n FROM {table}
+                      WHERE {column} ~ {pattern}) k
+                GROUP BY 1
+            ) TO STDOUT
+        """).format(**params), Sink())
+        cur.execute(sql.SQL("SELECT {column} FROM {table} WHERE {column} !~ {pattern}").format(**params))
+        keys.other.update(key for key, in cur.fetchall())
+        return keys
+
+
+class KeyFilter:
+    """Client-side FK check of parsed rows against [(column, KeySet)]; counts drops."""
+
+    def __init__(self, checks):
+        self.checks = checks
+        self.dropped = 0
+
+    def line_filter(self, columns):
+        """Predicate for COPY text lines of a table with these columns."""
+        checks = [(columns.index(column), keys) for column, keys in self.checks]
+        width = max(i for i, _ in checks) + 1
+
+        def keep(line):
+            fields = line.split("\t", width)
+            for i, keys in checks:
+                if fields[i] not in keys:
+                    return False
+            return True
+        return keep
+
+    def mask(self, batch):
+        """Row mask for an Arrow record batch (vectorized parser)."""
+        mask = arrow_parser.key_mask(batch, [(column, keys.bits, keys.prefix, keys.other)
+                                             for column, keys in self.checks], KEY_DIGITS)
+        self.dropped += len(mask) - mask.true_count
+        return mask
+
+
+class KeyFilterBuffer:
+    """Passes on only the COPY lines that pass the KeyFilter."""
+
+    def __init__(self, out, key_filter):
+        self.out = out
+        self.columns = out.columns
+        self.key_filter = key_filter
+        self.keep = key_filter.line_filter(out.columns)
+        self.rows = 0
+
+    def write(self, line):
+        if self.keep(line):
+            self.out.write(line)
+            self.rows += 1
+        else:
+            self.key_filter.dropped += 1
+
+    def write_block(self, text, rows):
+        kept = [line for line in text.splitlines(True) if self.keep(line)]
+        self.key_filter.dropped += rows - len(kept)
+        self.rows += len(kept)
+        if kept:
+            self.out.write_block("".join(kept), len(kept))
 
+
+class KeyFilterStream:
+    """Stands in for a CopyStream, wrapping every table in a KeyFilterBuffer."""
+
+    def __init__(self, stream, key_filter):
+        self.stream = stream
+        self.key_filter = key_filter
+
+    def table(self, table, columns):
+        return KeyFilterBuffer(self.stream.table(table, columns), self.key_filter)
+
+
+def load_prefilter(cur, step):
+    """KeyFilter for `step`'s client-side FK checks, or None if it has none."""
+    if step not in PREFILTER:
+        return None
+    checks = []
+    for column, table, prefix in PREFILTER[step]:
+        with timer(f"Loading {table}.{column} key set"):
+            checks.append((column, KeySet.load(cur, table, column, prefix)))
+    return KeyFilter(checks)
+
+
+# ── Checkpointed Import ─────────────────────────────────────────────────
+# A sequential import reads each TSV in chunks of IMPORT_CHECKPOINT_MB. Every
+# chunk is streamed, moved into the final tables and recorded in
+# import_checkpoint (byte offset reached, chunk count, rows read) in a single
+# transaction, so the checkpoint never disagrees with the data. --resume
+# skips finished steps and reopens the current file at its last committed
+# offset; a chunk that was interrupted was rolled back and is simply re-read.
+
+# TSV bytes (decompressed, for .gz) per committed chunk.
+IMPORT_CHECKPOINT_MB = int(os.getenv("IMPORT_CHECKPOINT_MB", 256))
+
+Checkpoint = namedtuple("Checkpoint", "source byte_offset chunks rows_read done")
+
+
+def file_source(path):
+    """Identify a TSV by name, size and mtime, so a resume can tell it is unchanged."""
+    st = path.stat()
+    return f"{path.name}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def load_checkpoints(conn, resume):
+    """
+    Create the checkpoint table if needed and return {step: Checkpoint}.
+    A fresh (non --resume) run clears it first.
+    """
     cur = conn.cursor()
-    buf = StringIO()
-    count = 0
-
-    with timer("Reading name.basics.tsv"):
-        with open(tsv_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
-            for row in reader:
-                nconst = row["nconst"]
-                name = (clean(row["primaryName"]) or "Unknown").replace("\t", " ").replace("\n", " ")
-                birth = clean(row["birthYear"])
-                death = clean(row["deathYear"])
-                buf.write(f"{nconst}\t{name}\t{birth or '\\N'}\t{death or '\\N'}\n")
-                count += 1
-                if count % 500_000 == 0:
-                    print(f"    read {count:,} people...", flush=True)
-
-    with timer(f"COPY {count:,} people"):
-        buf.seek(0)
-        cur.copy_from(
-            buf, "person",
-            columns=("nconst", "primary_name", "birth_year", "death_year"),
-            null="\\N"
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS import_checkpoint (
+            step        TEXT        PRIMARY KEY,
+            source      TEXT        NOT NULL,
+            byte_offset BIGINT      NOT NULL,
+            chunks      INTEGER     NOT NULL,
+            rows_read   BIGINT      NOT NULL,
+            done        BOOLEAN     NOT NULL DEFAULT FALSE,
+            updated_at  TIMESTAMPTZ NOT NULL DEFAULT now()
         )
-        conn.commit()
+    """)
+    if not resume:
+        cur.execute("TRUNCATE import_checkpoint")
+    cur.execute("SELECT step, source, byte_offset, chunks, rows_read, done FROM import_checkpoint")
+    checkpoints = {row[0]: Checkpoint(*row[1:]) for row in cur.fetchall()}
+    conn.commit()
+    cur.close()
+    return checkpoints
+
+
+def save_checkpoint(cur, step, checkpoint):
+    """Record the progress of `step`; takes effect with the caller's commit."""
+    cur.execute("""
+        INSERT INTO import_checkpoint (step, source, byte_offset, chunks, rows_read, done)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON CONFLICT (step) DO UPDATE SET
+            source = EXCLUDED.source,
+            byte_offset = EXCLUDED.byte_offset,
+            chunks = EXCLUDED.chunks,
+            rows_read = EXCLUDED.rows_read,
+            done = EXCLUDED.done,
+            updated_at = now()
+    """, (step, *checkpoint))
+
+
+def count_written(metrics, rows, result):
+    """
+    Add one COPY pass of `rows` main-table rows and its final insert's result
+    to `metrics`. Staged rows the insert did not take were FK orphans; steps
+    COPYed straight into their table (result None or a tuple) wrote them all.
+    """
+    if isinstance(result, int):
+        metrics.rows_written += result
+        metrics.rows_dropped += rows - result
+    else:
+        metrics.rows_written += rows
 
+
+def import_step(conn, step, checkpoint=None, metrics=None):
+    """
+    Import one step's TSV chunk by chunk, committing each chunk together with
+    its checkpoint. Picks up after `checkpoint` when given, and adds its
+    counters and timings to `metrics` (a StageMetrics) if given. Returns the
+    step's total rows read.
+    """
+    fname, _, finish, _ = STEPS[step]
+    tsv_path = find_tsv(fname)
+    if not tsv_path:
+        print(f"  ⚠ {TSV_DIR / fname}[.gz] not found, skipping {step}.")
+        return 0
+
+    source = file_source(tsv_path)
+    cp = checkpoint or Checkpoint(source, 0, 0, 0, False)
+    if cp.source != source:
+        raise RuntimeError(f"{tsv_path.name} changed since the interrupted run; "
+                           f"start over without --resume")
+    if cp.done:
+        print(f"  ✓ Already imported ({cp.rows_read:,} rows), skipping.")
+        return cp.rows_read
+    if cp.chunks:
+        print(f"  → Resuming {tsv_path.name} after chunk {cp.chunks} "
+              f"({cp.byte_offset / 1024 / 1024:,.0f} MB, {cp.rows_read:,} rows)")
+
+    cur = conn.cursor()
+    key_filter = load_prefilter(cur, step)
+    kinds = FULL_STAGING[step]
+    if key_filter:
+        kinds, finish = (), None  # rows arrive FK-safe; no staging needed
+
+    metrics = metrics or StageMetrics(step)
+    with open_range(tsv_path, cp.byte_offset, metrics=metrics) as (header, f):
+        offset = f.raw.offset
+        for chunk in read_chunks(f, IMPORT_CHECKPOINT_MB * 1024 * 1024):
+            with timer(f"Chunk {cp.chunks + 1} of {tsv_path.name}"):
+                staging = {kind: create_staging(cur, kind) for kind in kinds}
+                start = time.perf_counter()
+                with CopyStream(conn) as stream:
+                    count = parse_stream(step, header, io.BufferedReader(chunk, GZIP_PIPE_BYTES),
+                                         stream, staging, key_filter=key_filter, metrics=metrics)
+                metrics.parse_s += time.perf_counter() - start - stream.wait_s
+                metrics.copy_wait_s += stream.wait_s
+                metrics.encode_s += stream.encode_s
+
+                start = time.perf_counter()
+                count_written(metrics, count, finish(cur, staging) if finish else None)
+                offset += chunk.consumed
+                cp = cp._replace(byte_offset=offset, chunks=cp.chunks + 1,
+                                 rows_read=cp.rows_read + count)
+                save_checkpoint(cur, step, cp)
+                conn.commit()
+                metrics.server_s += time.perf_counter() - start
+
+    save_checkpoint(cur, step, cp._replace(done=True))
+    conn.commit()
     cur.close()
-    print(f"  ✓ Imported {count:,} people.")
+    if key_filter:
+        metrics.rows_dropped += key_filter.dropped
+    print(f"  ✓ Imported {cp.rows_read:,} {step} rows in {cp.chunks} chunk(s)"
+          + (f", {key_filter.dropped:,} FK orphans dropped." if key_filter else "."))
+    return cp.rows_read
+
+
+# ── Incremental Import ──────────────────────────────────────────────────
+# Each table's previous snapshot is summarized by a manifest in
+# IMPORT_STATE_DIR: one "key…\thash" line per key, in file order. IMDb dumps
+# are sorted by ID, so the incoming file and the manifest are merge-joined in
+# a single pass with constant memory, and only new, changed and removed keys
+# ever reach Postgres.
+
+# Key columns per staged table; lines sharing a key are diffed as one group.
+DELTA_KEYS = {
+    "title":       ("tconst",),
+    "title_genre": ("tconst",),
+    "person":      ("nconst",),
+    "rating":      ("tconst",),
+    "principal":   ("tconst", "ordering"),
+    "episode":     ("tconst",),
+}
+
+# step → tables staged for it in --incremental mode
+DELTA_STAGING = {
+    "titles":     ("title", "title_genre"),
+    "people":     ("person",),
+    "ratings":    ("rating",),
+    "principals": ("principal",),
+    "episodes":   ("episode",),
+}
+
 
+def key_order(key):
+    """Sort key matching IMDb file order: tt/nm IDs and orderings compare numerically."""
+    return tuple(int(k[2:]) if k[:2] in ("tt", "nm") else int(k) for k in key)
+
+
+def read_manifest(path):
+    """Yield (key, hash) pairs from a manifest, or nothing if there is none yet."""
+    if not path.exists():
+        return
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            yield parts[:-1], parts[-1]
 
-def import_principals(conn):
+
+class DeltaBuffer:
     """
-    Import title.principals.tsv → principal table.
-    
-    TSV columns: tconst, ordering, nconst, category, job, characters
-    Only imports rows where both tconst and nconst exist in their respective tables.
+    Diffs the lines written for one table against its previous manifest.
+
+    New and changed key groups are passed to `out`; keys that disappeared are
+    written to `deleted`. The replacement manifest is written alongside and
+    only takes effect on commit(), after the database transaction succeeded.
+    """
+
+    def __init__(self, kind, out, deleted):
+        self.kind = kind
+        self.out = out
+        self.deleted = deleted
+        self.width = len(DELTA_KEYS[kind])
+        self.path = IMPORT_STATE_DIR / f"{kind}.manifest.gz"
+        self.rows = 0
+        self.changed = 0
+        self.removed = 0
+        self._key = None
+        self._last = None
+        self._lines = []
+        self._old = read_manifest(self.path)
+        self._advance()
+        IMPORT_STATE_DIR.mkdir(parents=True, exist_ok=True)
+        self._new_path = self.path.with_suffix(".tmp")
+        self._new = gzip.open(self._new_path, "wt", encoding="utf-8", compresslevel=1)
+
+    def _advance(self):
+        self._old_key, self._old_hash = next(self._old, (None, None))
+        self._old_order = key_order(self._old_key) if self._old_key else None
+
+    def write(self, line):
+        self.rows += 1
+        key = line.split("\t", self.width)[:self.width]
+        if key != self._key:
+            self._emit()
+            self._key = key
+        self._lines.append(line)
+
+    def write_block(self, text, rows):
+        for line in text[:-1].split("\n"):
+            self.write(line + "\n")
+
+    def _emit(self):
+        if self._key is None:
+            return
+        key, order = self._key, key_order(self._key)
+        if self._last is not None and order <= self._last:
+            raise RuntimeError(f"{self.kind}: input is not sorted by key at "
+                               f"{'/'.join(key)}; run a full import instead")
+        self._last = order
+
+        group = "".join(self._lines)
+        digest = hashlib.blake2b(group.encode("utf-8"), digest_size=8).hexdigest()
+        while self._old_key is not None and self._old_order < order:
+            self._remove()
+        unchanged = self._old_key == key and self._old_hash == digest
+        if self._old_key == key:
+            self._advance()
+        if not unchanged:
+            for line in self._lines:
+                self.out.write(line)
+            self.changed += 1
+        self._new.write("\t".join(key) + f"\t{digest}\n")
+        self._lines = []
+
+    def _remove(self):
+        self.deleted.write("\t".join(self._old_key) + "\n")
+        self.removed += 1
+        self._advance()
+
+    def close(self):
+        self._emit()
+        while self._old_key is not None:
+            self._remove()
+        self._new.close()
+
+    def commit(self):
+        os.replace(self._new_path, self.path)
+
+
+class DeltaStream:
+    """
+    Stands in for a CopyStream during --incremental imports: every table the
+    copy_* functions register is wrapped in a DeltaBuffer writing to the
+    matching staging table and its <staging>_del key table.
+    """
+
+    def __init__(self, stream, staging):
+        self.stream = stream
+        self.kinds = {name: kind for kind, name in staging.items()}
+        self.buffers = []
+
+    def table(self, table, columns):
+        kind = self.kinds[table]
+        keys = DELTA_KEYS[kind]
+        buf = DeltaBuffer(kind, self.stream.table(table, columns),
+                          self.stream.table(f"{table}_del", keys))
+        self.buffers.append(buf)
+        return buf
+
+    def close(self):
+        for buf in self.buffers:
+            buf.close()
+
+    def commit(self):
+        for buf in self.buffers:
+            buf.commit()
+
+
+def _key_match(keys):
+    return sql.SQL(" AND ").join(
+        sql.SQL("t.{0} = d.{0}").format(sql.Identifier(k)) for k in keys)
+
+
+def upsert(cur, table, staging, columns, keys):
+    """Merge staged rows into `table`, updating every non-key column on conflict."""
+    cols = sql.SQL(", ").join(map(sql.Identifier, columns))
+    cur.execute(sql.SQL("""
+        INSERT INTO {table} ({cols})
+        SELECT {cols} FROM {staging}
+        ON CONFLICT ({keys}) DO UPDATE SET {updates}
+    """).format(
+        table=sql.Identifier(table), staging=sql.Identifier(staging), cols=cols,
+        keys=sql.SQL(", ").join(map(sql.Identifier, keys)),
+        updates=sql.SQL(", ").join(
+            sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(c))
+            for c in columns if c not in keys),
+    ))
+    return cur.rowcount
+
+
+def delete_keys(cur, table, keys_table, keys):
+    """Delete rows of `table` whose key appears in `keys_table`."""
+    cur.execute(sql.SQL("DELETE FROM {} t USING {} d WHERE {}").format(
+        sql.Identifier(table), sql.Identifier(keys_table), _key_match(keys)))
+    return cur.rowcount
+
+
+def apply_delta(cur, delta, staging, finish):
+    """
+    Apply one step's staged changes with set-based statements. Returns the
+    step's final insert result, if it has one.
+    """
+    for buf in delta.buffers:
+        if buf.kind in ("title", "person"):
+            upsert(cur, buf.kind, staging[buf.kind], buf.out.columns, DELTA_KEYS[buf.kind])
+    if "title_genre" in staging:
+        # A changed genre list replaces all of the title's links.
+        delete_keys(cur, "title_genre", staging["title_genre"], ("tconst",))
+    result = finish(cur, staging) if finish else None
+    for buf in delta.buffers:
+        delete_keys(cur, buf.kind, f"{staging[buf.kind]}_del", DELTA_KEYS[buf.kind])
+    return result
+
+
+def import_incremental(conn, report=None):
+    """
+    Apply only what changed since the last --incremental run.
+
+    Every step diffs its TSV against the stored manifest, stages the new,
+    changed and removed rows, then upserts and deletes them in one
+    transaction; the manifest is replaced only after that commit. With no
+    manifest yet, every row counts as new, so the first run upserts the
+    whole file. Rows dropped by FK filtering are only retried once their
+    own line changes. Each step is recorded as a stage of `report` if given.
+    """
+    report = report or RunReport()
+    for step, (fname, _, finish, _) in STEPS.items():
+        tsv_path = find_tsv(fname)
+        if not tsv_path:
+            print(f"  ⚠ {TSV_DIR / fname}[.gz] not found, skipping {step}.")
+            continue
+
+        print(f"\n  [{step}]")
+        cur = conn.cursor()
+        staging = {kind: create_staging(cur, kind) for kind in DELTA_STAGING[step]}
+        for kind, name in staging.items():
+            cur.execute(sql.SQL("CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA").format(
+                sql.Identifier(f"{name}_del"),
+                sql.SQL(", ").join(map(sql.Identifier, DELTA_KEYS[kind])),
+                sql.Identifier(name)))
+
+        with report.stage(step) as metrics:
+            with timer(f"Diffing {tsv_path.name} against last snapshot"):
+                with CopyStream(conn) as stream:
+                    delta = DeltaStream(stream, staging)
+                    count = parse_file(step, tsv_path, delta, staging, metrics=metrics)
+                    delta.close()
+            metrics.parse_s = metrics.elapsed() - stream.wait_s
+            metrics.copy_wait_s = stream.wait_s
+            metrics.encode_s = stream.encode_s
+
+            changed, removed = delta.buffers[0].changed, delta.buffers[0].removed
+            start = time.perf_counter()
+            with timer(f"Applying {changed:,} new/changed and {removed:,} removed"):
+                count_written(metrics, changed, apply_delta(cur, delta, staging, finish))
+                conn.commit()
+            metrics.server_s = time.perf_counter() - start
+            metrics.extra.update(changed=changed, removed=removed)
+            delta.commit()
+
+        cur.close()
+        print(f"  ✓ {step}: {count:,} rows read, {changed:,} new or changed, {removed:,} removed.")
+
+
+# ── Parallel Import ─────────────────────────────────────────────────────
+
+def parse_range(step, path, start, end, staging, memory_mb, parser, copy_format):
     """
-    tsv_path = TSV_DIR / "title.principals.tsv"
-    if not tsv_path.exists():
-        print(f"  ⚠ {tsv_path} not found, skipping principals.")
+    Worker process: stream one byte range of a TSV over a private connection.
+    Returns the number of rows read and the range's StageMetrics.
+    """
+    metrics = StageMetrics(step)
+    conn = get_conn()
+    try:
+        with CopyStream(conn, memory_mb, copy_format) as stream:
+            count = parse_file(step, path, stream, staging, start, end, parser, metrics)
+        conn.commit()
+    finally:
+        conn.close()
+    metrics.parse_s = metrics.elapsed() - stream.wait_s
+    metrics.copy_wait_s = stream.wait_s
+    metrics.encode_s = stream.encode_s
+    metrics.done()
+    return count, metrics
+
+
+def run_final(step, deps, staging, metrics):
+    """
+    Coordinator thread: wait for every future in `deps`, then run the step's
+    set-based final insert on its own connection. The workers' counters are
+    summed into `metrics`, so its parse and wait times are worker-seconds.
+    """
+    rows = 0
+    for f in deps[step]:
+        count, worker = f.result()  # re-raises worker errors
+        rows += count
+        metrics.merge(worker)
+    for dep in STEPS[step][3]:
+        for f in deps[dep]:
+            f.result()
+
+    finish = STEPS[step][2]
+    if finish is None:
+        count_written(metrics, rows, None)
+        metrics.done()
+        print(f"  ✓ {step}: {rows:,} rows", flush=True)
         return
 
+    start = time.time()
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        result = finish(cur, staging)
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+    metrics.server_s += time.time() - start
+    count_written(metrics, rows, result)
+    metrics.done()
+    inserted = "/".join(f"{n:,}" for n in (result if isinstance(result, tuple) else (result,)))
+    print(f"  ✓ {step}: {rows:,} rows read, {inserted} inserted "
+          f"({time.time() - start:.1f}s)", flush=True)
+
+
+def import_parallel(workers, report=None):
+    """
+    Import every TSV concurrently, each parsed in worker processes over their
+    own connections. Large files are split into byte ranges across the pool.
+
+    Titles and people are COPYed straight into their tables; ratings,
+    principals, episodes and genre links go through shared staging tables,
+    and their final inserts start as soon as the tables they join against
+    are loaded. Each step is recorded as a stage of `report` if given.
+    """
+    report = report or RunReport()
+    steps = {step: find_tsv(spec[0]) for step, spec in STEPS.items()}
+    for step, path in list(steps.items()):
+        if not path:
+            print(f"  ⚠ {TSV_DIR / STEPS[step][0]}[.gz] not found, skipping {step}.")
+            del steps[step]
+
+    conn = get_conn()
     cur = conn.cursor()
+    staging = {kind: create_staging(cur, kind, shared=True) for kind in FK_STAGING}
+    conn.commit()
+
+    # Keep the overall COPY buffer ceiling roughly where sequential mode has it.
+    memory_mb = max(16, IMPORT_MEMORY_MB // workers)
+
+    try:
+        with ProcessPoolExecutor(workers) as pool, ThreadPoolExecutor(len(STEPS)) as coord:
+            deps = {step: [] for step in STEPS}
+            for step, path in steps.items():
+                ranges = split_ranges(path, workers)
+                print(f"  → {step}: {len(ranges)} range(s) of {path.name}", flush=True)
+                deps[step] = [pool.submit(parse_range, step, str(path), s, e, staging,
+                                          memory_mb, IMPORT_PARSER, IMPORT_COPY_FORMAT)
+                              for s, e in ranges]
+            finals = [coord.submit(run_final, step, deps, staging, report.add_stage(step))
+                      for step in steps]
+            for f in finals:
+                f.result()
+    finally:
+        for name in staging.values():
+            cur.execute(f"DROP TABLE IF EXISTS {name}")
+        conn.commit()
+        cur.close()
+        conn.close()
+
+
+# ── Deferred Indexes ────────────────────────────────────────────────────
+# Loading into indexed, FK-checked tables makes COPY index-maintenance bound.
+# With --defer-indexes, secondary indexes and FK constraints of the loaded
+# tables are dropped first and rebuilt concurrently afterwards. Primary keys
+# and unique constraints stay: the final inserts' ON CONFLICT clauses need
+# them, and the FK-safe inserts keep the data valid for re-validation.
+
+LOADED_TABLES = ("title", "person", "rating", "principal", "episode", "genre", "title_genre")
+
+
+class DeferredDDL:
+    """
+    Secondary indexes and FK constraints captured from the catalog, with the
+    statements to recreate them. The statements are also saved to
+    IMPORT_STATE_DIR/deferred_ddl.sql until the rebuild succeeds, so a
+    crashed run can be repaired with psql -f.
+    """
 
-    # Load using temp table to handle FK mismatches
-    with timer("Reading title.principals.tsv"):
+    def __init__(self, conn):
+        self.conn = conn
+        self.path = IMPORT_STATE_DIR / "deferred_ddl.sql"
+        cur = conn.cursor()
         cur.execute("""
-            CREATE TEMP TABLE tmp_principal (
-                tconst VARCHAR(12),
-                ordering SMALLINT,
-                nconst VARCHAR(12),
-                category VARCHAR(30),
-                job TEXT,
-                characters TEXT
-            )
-        """)
-        
-        buf = StringIO()
-        count = 0
-        with open(tsv_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
-            for row in reader:
-                tconst = row["tconst"]
-                ordering = row["ordering"]
-                nconst = row["nconst"]
-                category = clean(row["category"]) or "unknown"
-                job = clean(row["job"])
-                characters = clean(row["characters"])
-                
-                # Escape tabs and newlines in text fields
-                if job:
-                    job = job.replace("\t", " ").replace("\n", " ")
-                if characters:
-                    characters = characters.replace("\t", " ").replace("\n", " ")
-                
-                buf.write("\t".join([
-                    tconst, ordering, nconst,
-                    category,
-                    job if job else "\\N",
-                    characters if characters else "\\N"
-                ]) + "\n")
-                count += 1
-                
-                if count % 1_000_000 == 0:
-                    print(f"    read {count:,} principals...", flush=True)
-                    # Flush in batches to avoid huge memory usage
-                    buf.seek(0)
-                    cur.copy_from(buf, "tmp_principal",
-                                  columns=("tconst", "ordering", "nconst", "category", "job", "characters"),
-                                  null="\\N")
-                    buf = StringIO()
-
-        # Final batch
-        if buf.tell() > 0:
-            buf.seek(0)
-            cur.copy_from(buf, "tmp_principal",
-                          columns=("tconst", "ordering", "nconst", "category", "job", "characters"),
-                          null="\\N")
-
-    with timer(f"Inserting {count:,} principals (FK-safe)"):
+            SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            WHERE i.indrelid = ANY(%s::regclass[])
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_constraint c
+                  WHERE c.conindid = i.indexrelid AND c.contype IN ('p', 'u', 'x'))
+            ORDER BY pg_relation_size(i.indrelid) DESC
+        """, (list(LOADED_TABLES),))
+        # biggest tables first, so the longest builds start earliest
+        self.indexes = cur.fetchall()
         cur.execute("""
-            INSERT INTO principal (tconst, ordering, nconst, category, job, characters)
-            SELECT tp.tconst, tp.ordering, tp.nconst, tp.category, tp.job, tp.characters
-            FROM tmp_principal tp
-            WHERE EXISTS (SELECT 1 FROM title t WHERE t.tconst = tp.tconst)
-              AND EXISTS (SELECT 1 FROM person p WHERE p.nconst = tp.nconst)
-            ON CONFLICT (tconst, ordering) DO NOTHING
-        """)
-        conn.commit()
+            SELECT conname, conrelid::regclass::text, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = ANY(%s::regclass[])
+            ORDER BY pg_relation_size(conrelid) DESC
+        """, (list(LOADED_TABLES),))
+        self.fks = cur.fetchall()
+        cur.close()
+
+    def fk_statements(self):
+        return [(name, f"ALTER TABLE {table} ADD CONSTRAINT {quote_ident(name)} {definition}")
+                for name, table, definition in self.fks]
+
+    def drop(self):
+        if self.path.exists():
+            raise RuntimeError(f"{self.path} is left from an interrupted run; "
+                               f"apply it with psql -f before dropping indexes again")
+        IMPORT_STATE_DIR.mkdir(parents=True, exist_ok=True)
+        self.path.write_text("".join(f"{stmt};\n" for _, stmt in self.indexes + self.fk_statements()))
+        cur = self.conn.cursor()
+        for name, table, _ in self.fks:
+            cur.execute(f"ALTER TABLE {table} DROP CONSTRAINT {quote_ident(name)}")
+        for name, _ in self.indexes:
+            cur.execute(f"DROP INDEX {name}")
+        self.conn.commit()
+        cur.close()
+        print(f"  → Dropped {len(self.indexes)} indexes and {len(self.fks)} FK constraints "
+              f"(saved to {self.path})")
+
+    def rebuild(self, workers):
+        """
+        Recreate indexes, then FK constraints, each batch spread over
+        `workers` connections. Returns (index seconds, FK seconds).
+        """
+        start = time.time()
+        run_ddl_concurrently(self.indexes, workers)
+        index_s = time.time() - start
+
+        start = time.time()
+        run_ddl_concurrently(self.fk_statements(), workers)
+        fk_s = time.time() - start
+
+        self.path.unlink(missing_ok=True)
+        return index_s, fk_s
+
+
+def quote_ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def run_ddl_concurrently(statements, workers):
+    """Run (label, DDL) pairs on a pool of autocommit connections with tuned maintenance memory."""
+    local = threading.local()
+    conns = []
+
+    def run(label, stmt):
+        if not hasattr(local, "cur"):
+            conn = get_conn()
+            conn.autocommit = True
+            conns.append(conn)
+            local.cur = conn.cursor()
+            local.cur.execute("SET maintenance_work_mem = %s", (IMPORT_MAINTENANCE_MEM,))
+        start = time.time()
+        local.cur.execute(stmt)
+        print(f"    ✓ {label} ({time.time() - start:.1f}s)", flush=True)
+
+    try:
+        with ThreadPoolExecutor(max(1, workers)) as pool:
+            for f in [pool.submit(run, label, stmt) for label, stmt in statements]:
+                f.result()
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+# ── Blue/Green Swap ─────────────────────────────────────────────────────
+# With --swap the whole load goes into SHADOW_SCHEMA while the app keeps
+# reading LIVE_SCHEMA. Once indexes are built and statistics gathered, one
+# short transaction moves the live tables to PREVIOUS_SCHEMA and the shadow
+# tables into the live schema. Tables are moved with SET SCHEMA (indexes,
+# constraints and owned sequences follow), so extensions and anything else
+# in the live schema stay put. --rollback swaps live and previous back.
+
+LIVE_SCHEMA = os.getenv("IMPORT_LIVE_SCHEMA", "public")
+SHADOW_SCHEMA = "imdb_shadow"
+PREVIOUS_SCHEMA = "imdb_previous"
+SCHEMA_SQL = PROJECT_ROOT / "schema" / "schema.sql"
+
+# Everything schema.sql creates, including app-written streaming links.
+SWAPPED_TABLES = LOADED_TABLES + ("streaming_link",)
+
+# The swap waits at most this long for each table lock before retrying, so
+# it never queues app reads behind it for long.
+SWAP_LOCK_TIMEOUT = "3s"
+SWAP_ATTEMPTS = 10
+
+
+def prepare_shadow(conn, keep=False):
+    """
+    Recreate the shadow schema from schema/schema.sql and point this and
+    every later importer connection (workers included) at it. With `keep`
+    (--resume), an existing shadow schema is reused as it is.
+    """
+    search_path = f"{SHADOW_SCHEMA}, {LIVE_SCHEMA}"
+    cur = conn.cursor()
+    cur.execute("SELECT 1 FROM pg_namespace WHERE nspname = %s", (SHADOW_SCHEMA,))
+    if not (keep and cur.fetchone()):
+        cur.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(SHADOW_SCHEMA)))
+        cur.execute(sql.SQL("CREATE SCHEMA {}").format(sql.Identifier(SHADOW_SCHEMA)))
+    cur.execute(f"SET search_path TO {search_path}")
+    cur.execute(SCHEMA_SQL.read_text(encoding="utf-8"))
+    conn.commit()
+    cur.close()
+    # libpq reads PGOPTIONS, and child processes inherit the environment.
+    os.environ["PGOPTIONS"] = (os.getenv("PGOPTIONS", "") +
+                               f" -c search_path={SHADOW_SCHEMA},{LIVE_SCHEMA}").strip()
 
-    cur.execute("DROP TABLE IF EXISTS tmp_principal")
+
+def analyze_shadow(conn):
+    cur = conn.cursor()
+    for table in SWAPPED_TABLES:
+        cur.execute(sql.SQL("ANALYZE {}.{}").format(
+            sql.Identifier(SHADOW_SCHEMA), sql.Identifier(table)))
     conn.commit()
     cur.close()
-    print(f"  ✓ Imported principals from {count:,} rows.")
+
+
+def _move_tables(cur, src, dst):
+    for table in SWAPPED_TABLES:
+        cur.execute(sql.SQL("ALTER TABLE {}.{} SET SCHEMA {}").format(
+            sql.Identifier(src), sql.Identifier(table), sql.Identifier(dst)))
+
+
+def _locked_transaction(conn, fn):
+    """Run fn(cur) in one transaction, retrying when a table lock is busy."""
+    for attempt in range(1, SWAP_ATTEMPTS + 1):
+        cur = conn.cursor()
+        try:
+            cur.execute("SET LOCAL lock_timeout = %s", (SWAP_LOCK_TIMEOUT,))
+            fn(cur)
+            conn.commit()
+            return
+        except psycopg2.errors.LockNotAvailable:
+            conn.rollback()
+            if attempt == SWAP_ATTEMPTS:
+                raise
+            print(f"    lock busy, retrying ({attempt}/{SWAP_ATTEMPTS})...", flush=True)
+            time.sleep(1)
+        finally:
+            cur.close()
+
+
+def swap_live(conn):
+    """
+    Promote the shadow tables to live; the replaced generation is kept in
+    PREVIOUS_SCHEMA until the next swap. Everything happens in one locked
+    transaction: the live title and streaming_link tables are locked
+    against writes first, cached posters and streaming links written by
+    the app during the import are carried over, and only then is the old
+    previous generation dropped, so a swap that never gets its locks
+    leaves --rollback something to restore.
+    """
+    def swap(cur):
+        params = {"live": sql.Identifier(LIVE_SCHEMA), "shadow": sql.Identifier(SHADOW_SCHEMA),
+                  "previous": sql.Identifier(PREVIOUS_SCHEMA)}
+        # EXCLUSIVE still lets the app read; it only holds back writes to carry over
+        cur.execute(sql.SQL("LOCK TABLE {live}.title, {live}.streaming_link IN EXCLUSIVE MODE")
+                    .format(**params))
+        cur.execute(sql.SQL("""
+            UPDATE {shadow}.title s SET poster_url = l.poster_url
+            FROM {live}.title l
+            WHERE l.tconst = s.tconst AND l.poster_url IS NOT NULL
+        """).format(**params))
+        cur.execute(sql.SQL("""
+            INSERT INTO {shadow}.streaming_link (tconst, platform, url)
+            SELECT l.tconst, l.platform, l.url
+            FROM {live}.streaming_link l
+            WHERE EXISTS (SELECT 1 FROM {shadow}.title t WHERE t.tconst = l.tconst)
+            ON CONFLICT DO NOTHING
+        """).format(**params))
+        cur.execute(sql.SQL("DROP SCHEMA IF EXISTS {previous} CASCADE").format(**params))
+        cur.execute(sql.SQL("CREATE SCHEMA {previous}").format(**params))
+        _move_tables(cur, LIVE_SCHEMA, PREVIOUS_SCHEMA)
+        _move_tables(cur, SHADOW_SCHEMA, LIVE_SCHEMA)
+        cur.execute(sql.SQL("DROP TABLE IF EXISTS {shadow}.import_checkpoint").format(**params))
+        cur.execute(sql.SQL("DROP SCHEMA {shadow}").format(**params))
+
+    _locked_transaction(conn, swap)
+
+
+def rollback_swap(conn):
+    """Swap the live tables with the previous generation kept by --swap."""
+    def swap(cur):
+        cur.execute(sql.SQL("CREATE SCHEMA {}").format(sql.Identifier(SHADOW_SCHEMA)))
+        _move_tables(cur, LIVE_SCHEMA, SHADOW_SCHEMA)
+        _move_tables(cur, PREVIOUS_SCHEMA, LIVE_SCHEMA)
+        _move_tables(cur, SHADOW_SCHEMA, PREVIOUS_SCHEMA)
+        cur.execute(sql.SQL("DROP SCHEMA {}").format(sql.Identifier(SHADOW_SCHEMA)))
+
+    _locked_transaction(conn, swap)
+
+
+# ── Physical Layout ─────────────────────────────────────────────────────
+# COPY leaves rows in file (or, with --parallel, worker arrival) order, so a
+# title's cast or a series' episodes can be spread over many heap pages.
+# --optimize-layout rewrites the detail-page tables in the order they are
+# read, then VACUUM ANALYZE sets the visibility map so the covering indexes
+# in schema.sql can answer title, person and series lookups index-only.
+# CLUSTER locks each table exclusively while it runs; with --swap that is
+# the shadow copy, which nothing reads yet.
+
+# (table, index whose order it is rewritten in)
+CLUSTER_ON = (
+    ("principal", "principal_pkey"),       # title pages: one title's rows together
+    ("episode", "idx_episode_season"),     # series pages: by parent, season, episode
+    ("title_genre", "title_genre_pkey"),
+)
+
+
+def optimize_layout(workers):
+    """CLUSTER the detail-page tables, then VACUUM ANALYZE every table, over `workers` connections."""
+    run_ddl_concurrently([(f"CLUSTER {table}", f"CLUSTER {table} USING {index}")
+                          for table, index in CLUSTER_ON], workers)
+    run_ddl_concurrently([(f"VACUUM ANALYZE {table}", f"VACUUM (ANALYZE) {table}")
+                          for table in SWAPPED_TABLES], workers)
 
 
 # ── Main ────────────────────────────────────────────────────────────────
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load IMDb TSV files into PostgreSQL.")
+    parser.add_argument("--parallel", action="store_true",
+                        help="parse files concurrently in worker processes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="worker processes for --parallel (default: CPU count)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="apply only rows changed since the last --incremental run")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted import from its last committed chunk")
+    parser.add_argument("--parser", choices=("auto", "arrow", "csv"), default=IMPORT_PARSER,
+                        help="TSV parser backend (default: arrow if pyarrow is installed)")
+    parser.add_argument("--copy-format", choices=("text", "binary"), default=IMPORT_COPY_FORMAT,
+                        help="COPY wire format (default: text; binary is for benchmarking "
+                             "and slows the client down)")
+    parser.add_argument("--defer-indexes", action="store_true",
+                        help="drop secondary indexes and FKs during the load, rebuild after")
+    parser.add_argument("--swap", action="store_true",
+                        help="load into a shadow schema and swap it live atomically when done")
+    parser.add_argument("--rollback", action="store_true",
+                        help="swap the previous generation back in and exit")
+    parser.add_argument("--optimize-layout", action="store_true",
+                        help="CLUSTER the detail-page tables and VACUUM ANALYZE after the load "
+                             "(locks each table while it runs; pair with --swap on a live site)")
+    parser.add_argument("--index-workers", type=int, default=min(4, os.cpu_count() or 4),
+                        help="concurrent index/FK builds for --defer-indexes and "
+                             "--optimize-layout (default: 4)")
+    parser.add_argument("--report", type=Path,
+                        help="write the JSON run report here (default: IMPORT_STATE_DIR/reports/)")
+    parser.add_argument("--progress", action="store_true",
+                        help="show a live progress line on stderr while a file is read")
+    args = parser.parse_args(argv)
+    if args.parallel and args.incremental:
+        parser.error("--incremental cannot be combined with --parallel")
+    if args.incremental and args.defer_indexes:
+        parser.error("--defer-indexes is meant for full loads, not --incremental")
+    if args.incremental and args.optimize_layout:
+        parser.error("--optimize-layout rewrites whole tables; it is meant for full loads")
+    if args.incremental and args.swap:
+        parser.error("--swap loads a complete new generation; it cannot be --incremental")
+    if args.resume and (args.parallel or args.incremental):
+        parser.error("--resume continues a sequential full import; "
+                     "--parallel and --incremental runs are not checkpointed")
+    try:
+        args.parser = resolve_parser(args.parser)
+    except RuntimeError as e:
+        parser.error(str(e))
+    return args
+
+
+def print_counts(conn):
+    cur = conn.cursor()
+    for table in ["title", "person", "rating", "principal", "episode", "genre", "title_genre"]:
+        cur.execute(f"SELECT COUNT(*) FROM {table}")
+        print(f"  {table}: {cur.fetchone()[0]:,} rows")
+    cur.close()
+
+
+def import_sequential(conn, report, incremental=False, resume=False):
+    """Run every step on one connection, rolling back the open chunk on error."""
+    try:
+        if incremental:
+            import_incremental(conn, report)
+            return
+
+        checkpoints = load_checkpoints(conn, resume)
+        for i, step in enumerate(STEPS, 1):
+            print(f"\n[{i}/{len(STEPS)}] Importing {step}...")
+            with report.stage(step) as metrics:
+                import_step(conn, step, checkpoints.get(step), metrics)
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\nERROR: {e}")
+        if not incremental:
+            print("Committed chunks are kept; run again with --resume to continue.")
+        raise
+
+
+def main(argv=None):
+    global IMPORT_PARSER, IMPORT_COPY_FORMAT
+    args = parse_args(argv)
+    IMPORT_PARSER = args.parser
+    IMPORT_COPY_FORMAT = args.copy_format
+
     print("=" * 60)
     print("IMDb Clone — Data Import")
     print("=" * 60)
     print(f"Database: {DB_CONFIG['dbname']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}")
     print(f"TSV dir:  {TSV_DIR}")
+    print(f"Parser:   {args.parser}, COPY format {args.copy_format}")
+    if args.parallel:
+        print(f"Mode:     parallel ({args.workers} workers)")
+    elif args.incremental:
+        print(f"Mode:     incremental (state in {IMPORT_STATE_DIR})")
+    elif args.resume:
+        print("Mode:     resuming from the last checkpoint")
+    if args.swap:
+        print(f"Target:   {SHADOW_SCHEMA} → swapped into {LIVE_SCHEMA} when done")
+    if args.optimize_layout:
+        print("Layout:   CLUSTER " + ", ".join(t for t, _ in CLUSTER_ON) + ", then VACUUM ANALYZE")
     print()
 
+    if args.rollback:
+        conn = get_conn()
+        try:
+            rollback_swap(conn)
+        finally:
+            conn.close()
+        print(f"✅ Swapped {PREVIOUS_SCHEMA} back into {LIVE_SCHEMA}.")
+        return
+
     if not TSV_DIR.exists():
         print(f"ERROR: TSV directory not found: {TSV_DIR}")
         sys.exit(1)
 
+    report = RunReport(
+        progress=args.progress,
+        mode="parallel" if args.parallel else "incremental" if args.incremental else "sequential",
+        workers=args.workers if args.parallel else 1,
+        resume=args.resume, parser=args.parser, copy_format=args.copy_format,
+        defer_indexes=args.defer_indexes, swap=args.swap, optimize_layout=args.optimize_layout,
+        memory_mb=IMPORT_MEMORY_MB, checkpoint_mb=IMPORT_CHECKPOINT_MB,
+    )
     conn = get_conn()
     conn.autocommit = False
 
     try:
-        print("\n[1/4] Importing titles + genres...")
-        import_titles(conn)
+        if args.swap:
+            prepare_shadow(conn, keep=args.resume)
 
-        print("\n[2/4] Importing people...")
-        import_people(conn)
+        deferred = None
+        if args.defer_indexes:
+            deferred = DeferredDDL(conn)
+            deferred.drop()
 
-        print("\n[3/4] Importing ratings...")
-        import_ratings(conn)
+        start = time.time()
+        try:
+            if args.parallel:
+                import_parallel(args.workers, report)
+            else:
+                import_sequential(conn, report, args.incremental, args.resume)
+        finally:
+            load_s = time.time() - start
+            if deferred:
+                print(f"\n  Rebuilding indexes and FK constraints "
+                      f"({args.index_workers} workers, maintenance_work_mem={IMPORT_MAINTENANCE_MEM})...")
+                with report.stage("rebuild_ddl") as metrics:
+                    index_s, fk_s = deferred.rebuild(args.index_workers)
+                    metrics.server_s = index_s + fk_s
+                    metrics.extra.update(index_s=round(index_s, 3), indexes=len(deferred.indexes),
+                                         fk_s=round(fk_s, 3), fks=len(deferred.fks))
 
-        print("\n[4/4] Importing principals (cast & crew)...")
-        import_principals(conn)
+        if args.optimize_layout:
+            print(f"\n  Optimizing physical layout ({args.index_workers} workers)...")
+            with report.stage("layout") as metrics:
+                optimize_layout(args.index_workers)
+            layout_s = metrics.wall_s
 
-        # Final counts
-        cur = conn.cursor()
-        for table in ["title", "person", "rating", "principal", "genre", "title_genre"]:
-            cur.execute(f"SELECT COUNT(*) FROM {table}")
-            print(f"  {table}: {cur.fetchone()[0]:,} rows")
-        cur.close()
+        print("\n  Timing:")
+        print(f"    load           {load_s:8.1f}s")
+        if deferred:
+            print(f"    index build    {index_s:8.1f}s  ({len(deferred.indexes)} indexes)")
+            print(f"    FK validation  {fk_s:8.1f}s  ({len(deferred.fks)} constraints)")
+        if args.optimize_layout:
+            print(f"    layout         {layout_s:8.1f}s  ({len(CLUSTER_ON)} tables clustered)")
 
-    except Exception as e:
-        conn.rollback()
-        print(f"\nERROR: {e}")
-        raise
+        if args.swap:
+            if not args.optimize_layout:  # the layout step already analyzed
+                with report.stage("analyze"), timer(f"ANALYZE {SHADOW_SCHEMA}"):
+                    analyze_shadow(conn)
+            with report.stage("swap"), timer(f"Swapping {SHADOW_SCHEMA} into {LIVE_SCHEMA}"):
+                swap_live(conn)
+
+        # Final counts
+        print_counts(conn)
+        report.status = "ok"
     finally:
         conn.close()
+        if report.status != "ok":
+            report.status = "failed"
+        print(f"\n  Report: {report.save(args.report)}")
 
     print("\n✅ Import complete!")
 
@@ -91,7 +91,7 @@ WHERE t.tconst = $1;
 -- Output:   nconst, primary_name, category
 -- Design:   Filters principal by category IN ('director','writer').
 --           Ordered by billing (ordering) to show lead director first.
--- Perf:     Uses idx_principal_tconst + idx_principal_category.
+-- Perf:     Index-only scan of principal_pkey (INCLUDEs nconst, category).
 -- ────────────────────────────────────────────────────────────
 
 SELECT p.nconst, p.primary_name, pr.category
@@ -156,7 +156,7 @@ ORDER BY
 -- Inputs:   $1 = parent tconst
 -- Output:   season_number (distinct, sorted)
 -- Design:   Simple DISTINCT on episode table.
---           Uses idx_episode_parent.
+--           Index-only scan of idx_episode_season.
 -- ────────────────────────────────────────────────────────────
 
 SELECT DISTINCT e.season_number
@@ -210,7 +210,8 @@ FROM person WHERE nconst = $1;
 -- Design:   Joins principal (by nconst) → title → rating.
 --           Ordered by role priority then year descending.
 --           Frontend groups by category and 50 items per group.
--- Perf:     Uses idx_principal_nconst.
+-- Perf:     Uses idx_principal_nconst (INCLUDEs tconst, category); characters
+--           and job come from the heap.
 -- ────────────────────────────────────────────────────────────
 
 SELECT pr.category, t.tconst, t.primary_title, t.title_type, t.start_year,
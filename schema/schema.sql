@@ -2,7 +2,8 @@
 -- IMDb Clone — Database Schema  v2.0
 -- ============================================================
 -- PostgreSQL 12+
--- Now includes: poster_url, streaming_link, composite indexes
+-- Now includes: poster_url, streaming_link, composite indexes,
+-- covering indexes for the detail pages (INCLUDE needs PostgreSQL 11+)
 -- ============================================================
 
 -- 1. title: movies, series, episodes, shorts, etc.
@@ -42,7 +43,7 @@ CREATE TABLE IF NOT EXISTS principal (
   category        VARCHAR(30)  NOT NULL,
   job             TEXT,
   characters      TEXT,
-  PRIMARY KEY (tconst, ordering)
+  PRIMARY KEY (tconst, ordering) INCLUDE (nconst, category)   -- covering: title crew is index-only
 );
 
 -- 5. genre
@@ -60,9 +61,10 @@ CREATE TABLE IF NOT EXISTS title_genre (
 
 -- 7. rating
 CREATE TABLE IF NOT EXISTS rating (
-  tconst          VARCHAR(12) PRIMARY KEY REFERENCES title(tconst) ON DELETE CASCADE,
+  tconst          VARCHAR(12) NOT NULL REFERENCES title(tconst) ON DELETE CASCADE,
   average_rating  NUMERIC(3,1) NOT NULL,
-  num_votes       INTEGER      NOT NULL
+  num_votes       INTEGER      NOT NULL,
+  PRIMARY KEY (tconst) INCLUDE (average_rating, num_votes)   -- covering: rating joins are index-only
 );
 
 -- 8. streaming_link: external streaming/watch links
@@ -90,14 +92,13 @@ CREATE INDEX IF NOT EXISTS idx_title_type_adult     ON title(title_type, is_adul
 -- Person lookups
 CREATE INDEX IF NOT EXISTS idx_person_name          ON person(primary_name);
 
--- Principal lookups
-CREATE INDEX IF NOT EXISTS idx_principal_tconst     ON principal(tconst);
-CREATE INDEX IF NOT EXISTS idx_principal_nconst     ON principal(nconst);
+-- Principal lookups (title crew is index-only via principal_pkey; filmography reads
+-- characters from the heap, since unbounded TEXT must not go into a btree)
+CREATE INDEX IF NOT EXISTS idx_principal_nconst     ON principal(nconst) INCLUDE (tconst, category);
 CREATE INDEX IF NOT EXISTS idx_principal_category   ON principal(category);
 
--- Episode lookups
-CREATE INDEX IF NOT EXISTS idx_episode_parent       ON episode(parent_tconst);
-CREATE INDEX IF NOT EXISTS idx_episode_season       ON episode(parent_tconst, season_number);
+-- Episode lookups (covering: seasons and episode lists are index-only)
+CREATE INDEX IF NOT EXISTS idx_episode_season       ON episode(parent_tconst, season_number, episode_number) INCLUDE (tconst);
 
 -- Rating lookups & sorting
 CREATE INDEX IF NOT EXISTS idx_rating_votes         ON rating(num_votes DESC);
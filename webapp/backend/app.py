@@ -1,10 +1,10 @@
 """
 IMDb Clone — Flask Backend
-Registers all blueprints, DB pool, CORS, timing middleware.
+Registers all blueprints, DB pool, CORS, timing and HTTP caching middleware.
 """
 import os, time
 from pathlib import Path
-from flask import Flask, g, jsonify, send_from_directory
+from flask import Flask, g, jsonify, request, send_from_directory
 from flask_cors import CORS
 from dotenv import load_dotenv
 
@@ -12,7 +12,8 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 load_dotenv(PROJECT_ROOT / ".env")
 FRONTEND_DIR = Path(__file__).resolve().parent.parent / "frontend"
 
-from .db import init_pool
+from .db import init_pool, init_app
+from .jsonio import FastJSONProvider
 from .routes.health import health_bp
 from .routes.home import home_bp
 from .routes.title import title_bp
@@ -24,11 +25,30 @@ from .routes.streaming import streaming_bp
 from .routes.genres import genres_bp
 from .routes.discover import discover_bp
 
+# Cache-Control per blueprint for successful GETs; anything unlisted gets none,
+# and a route may set its own. Ages follow the server-side caches behind each
+# route (TMDB: 10 min, home: 5 min); routes reading live tables use no-cache,
+# so clients revalidate with their ETag every time.
+CACHE_POLICIES = {
+    "genres": "public, max-age=86400",
+    "title": "public, max-age=600",
+    "person": "public, max-age=600",
+    "series": "public, max-age=600",
+    "streaming": "no-cache",          # links are edited through POST on the same URL
+    "home": "public, max-age=300",
+    "discover": "public, max-age=60",
+    "search": "public, max-age=60",
+    "posters": "public, max-age=3600",  # stored poster URLs; the placeholder is no-store
+    "health": "no-store",
+}
+
 
 def create_app():
     app = Flask(__name__, static_folder=str(FRONTEND_DIR / "static"))
+    app.json = FastJSONProvider(app)
     CORS(app)
     init_pool()
+    init_app(app)
 
     @app.route("/")
     def index():
@@ -49,6 +69,18 @@ def create_app():
             response.headers["X-Response-Time"] = f"{elapsed:.0f}ms"
         return response
 
+    @app.after_request
+    def http_cache(response):
+        """ETag from the body hash (If-None-Match gets a 304) and the blueprint's Cache-Control."""
+        policy = CACHE_POLICIES.get(request.blueprint)
+        if policy is None or request.method not in ("GET", "HEAD") or response.status_code != 200:
+            return response
+        response.headers.setdefault("Cache-Control", policy)
+        if not response.is_streamed and response.headers["Cache-Control"] != "no-store":  # streamed bodies aren't buffered to hash
+            response.add_etag(overwrite=False)
+            response.make_conditional(request)
+        return response
+
     @app.errorhandler(404)
     def not_found(e):
         return jsonify({"error": "Not found"}), 404
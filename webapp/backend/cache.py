@@ -0,0 +1,280 @@
+"""
+Response Cache Backends
+=======================
+One small get/set interface over interchangeable stores, chosen by the
+CACHE_URL environment variable:
+
+    memory                      per-process LRU within CACHE_MEMORY_MB (default)
+    sqlite:///path/to/cache.db  file shared by every worker on the host
+    redis://host:6379/0         Redis or any Redis-compatible server (needs redis-py)
+
+With gunicorn running several workers, the memory backend leaves each one
+with its own copy and its own misses; the shared backends let one worker's
+TMDB call or home query serve them all. Values are pickled, so any result
+a route caches (Decimals included) round-trips unchanged.
+"""
+
+import os
+import json
+import time
+import zlib
+import pickle
+import random
+import sqlite3
+import threading
+from collections import OrderedDict
+
+MEMORY_MB = int(os.getenv("CACHE_MEMORY_MB", "64"))
+
+
+class MemoryCache:
+    """
+    Per-process LRU holding at most `max_bytes` of entries. Sizes are the
+    caller's estimate (the pickled size when none is given), so the budget
+    bounds growth rather than measuring the heap exactly.
+    """
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()   # key -> (value, expires, size), oldest first
+        self._bytes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires, size = entry
+            if expires is not None and expires <= time.time():
+                del self._data[key]
+                self._bytes -= size
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None, size=None):
+        if size is None:
+            size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            if self.max_bytes and size > self.max_bytes:
+                return
+            self._data[key] = (value, time.time() + ttl if ttl else None, size)
+            self._bytes += size
+            while self.max_bytes and self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._data.popitem(last=False)
+                self._bytes -= evicted
+                self._evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+
+    def stats(self):
+        return {"entries": len(self._data), "bytes": self._bytes,
+                "max_bytes": self.max_bytes, "evictions": self._evictions}
+
+
+class SQLiteCache:
+    """
+    Table in a local SQLite file (WAL mode), shared by every process that
+    opens it. Each process and thread gets its own connection, opened
+    lazily so nothing is shared across gunicorn's fork.
+    """
+
+    PRUNE_EVERY = 1000  # on average, one write in this many drops expired rows
+    MMAP_BYTES = 0      # PRAGMA mmap_size: read pages through a memory map when set
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if self.MMAP_BYTES:
+                conn.execute(f"PRAGMA mmap_size={int(self.MMAP_BYTES)}")
+            conn.execute("""CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)""")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, time.time())).fetchone()
+        return self._loads(row[0]) if row else None
+
+    def set(self, key, value, ttl=None, size=None):
+        conn = self._conn()
+        conn.execute("INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                     (key, self._dumps(value), time.time() + ttl if ttl else None))
+        if random.randrange(self.PRUNE_EVERY) == 0:
+            conn.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+
+    def delete(self, key):
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def _dumps(self, value):
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def _loads(self, blob):
+        return pickle.loads(blob)
+
+
+class CompressedJSONCache(SQLiteCache):
+    """
+    SQLiteCache for JSON-able values, stored as zlib-compressed JSON and read
+    through a memory map. Meant to outlive the process: entries are only
+    read when asked for, so opening a large file costs nothing at startup.
+    """
+
+    MMAP_BYTES = 256 * 1024 * 1024
+
+    def _dumps(self, value):
+        return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), 6)
+
+    def _loads(self, blob):
+        return json.loads(zlib.decompress(blob))
+
+
+class RedisCache:
+    """Redis (or compatible) server; expiry is left to the server."""
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_URL=redis://… needs the redis package (pip install redis)")
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key):
+        value = self._redis.get(key)
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl=None, size=None):
+        self._redis.set(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+                        ex=max(1, round(ttl)) if ttl else None)
+
+    def delete(self, key):
+        self._redis.delete(key)
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time in this process. Callers
+    that arrive while one is running wait for its result, or its exception,
+    instead of starting their own. A caller that has waited `timeout`
+    seconds stops waiting and computes the value itself.
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            if not call.done.wait(self.timeout):
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        try:
+            call.value = fn()
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class Namespace:
+    """A backend seen through a key prefix, so modules can't collide."""
+
+    def __init__(self, backend, prefix):
+        self.backend = backend
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.backend.get(self.prefix + key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value, ttl=None, size=None):
+        self.backend.set(self.prefix + key, value, ttl, size)
+
+    def delete(self, key):
+        self.backend.delete(self.prefix + key)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def open_backend(url):
+    """Backend for a CACHE_URL value."""
+    if not url or url == "memory":
+        return MemoryCache(MEMORY_MB * 1024 * 1024)
+    if url.startswith("sqlite:///"):
+        return SQLiteCache(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCache(url)
+    raise ValueError(f"unsupported CACHE_URL: {url}")
+
+
+_backend = None
+_namespaces = {}
+_backend_lock = threading.Lock()
+
+
+def get_cache(namespace):
+    """The configured cache, with keys prefixed by `namespace`."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = open_backend(os.getenv("CACHE_URL", "memory"))
+        if namespace not in _namespaces:
+            _namespaces[namespace] = Namespace(_backend, f"{namespace}:")
+        return _namespaces[namespace]
+
+
+def cache_stats():
+    """Hit/miss counts per namespace, plus size and evictions for the memory backend."""
+    if _backend is None:
+        return None
+    stats = {"backend": type(_backend).__name__,
+             "namespaces": {name: ns.stats() for name, ns in _namespaces.items()}}
+    if hasattr(_backend, "stats"):
+        stats.update(_backend.stats())
+    return stats
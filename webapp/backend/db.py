@@ -2,32 +2,234 @@
 Database connection pool using psycopg2.
 Provides get_conn() / put_conn() for request-scoped connections.
 Enforces 10-second statement timeout for performance safety.
+
+Inside a request, query() reuses one connection checked out on first use
+and returned by a teardown hook (see init_app), so a route making several
+queries costs one pool checkout. Outside a request (background threads,
+scripts) each query() call checks a connection out and back in.
+
+Pool size and checkout timeout come from DB_POOL_MIN, DB_POOL_MAX and
+DB_POOL_TIMEOUT; pool_stats() reports how the pool is being used.
+
+With DB_REPLICA_URLS set (comma-separated DSNs), query() and read_only()
+read from the healthy replicas in turn, falling back to the primary when
+none is usable. get_conn() / put_conn() always use the primary, so writes
+(streaming links, the poster cache) never reach a replica.
+
+Hot route queries are registered as Statements: each connection PREPAREs
+one the first time it runs it and EXECUTEs it from then on, skipping parse
+and plan. DB_PREPARE=0 runs them as plain SQL (e.g. behind a transaction
+pooler); statement_stats() reports calls and latency either way.
 """
 
 import os
+import re
+import time
+import weakref
+import itertools
+import threading
+from contextlib import contextmanager
+
 import psycopg2
 from psycopg2 import pool
+from flask import g, has_app_context
 
 _pool = None
 
+POOL_MIN = int(os.getenv("DB_POOL_MIN", 2))
+POOL_MAX = int(os.getenv("DB_POOL_MAX", 10))
+# Seconds a checkout waits for a free connection before raising PoolError.
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 5))
+
+REPLICA_URLS = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+# How often replicas are probed, and the replay lag past which one is skipped.
+REPLICA_CHECK_S = float(os.getenv("DB_REPLICA_CHECK_S", 10))
+REPLICA_MAX_LAG_S = float(os.getenv("DB_REPLICA_MAX_LAG_S", 30))
+
+_replicas = []
+_next_replica = itertools.count()
+
+USE_PREPARED = os.getenv("DB_PREPARE", "1") != "0"
+STATEMENTS = {}                           # name → Statement
+_prepared = weakref.WeakKeyDictionary()   # connection → names prepared on it
+_prepared_lock = threading.Lock()
+
+
+class InstrumentedPool(pool.ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool that waits up to `timeout` seconds for a
+    connection to be returned when all `maxconn` are checked out (the base
+    class raises PoolError at once), and counts checkout waits, hold times,
+    exhaustion and connection churn for stats().
+    """
+
+    def __init__(self, minconn, maxconn, *args, timeout=0, **kwargs):
+        self.timeout = timeout
+        self._free = threading.Condition()
+        self._returns = 0     # bumped on every putconn, so waiters never miss one
+        self._waiting = 0
+        self._since = {}      # id(conn) → checkout time
+        self._counts = dict.fromkeys(
+            ("checkouts", "exhausted", "timeouts", "opened", "closed"), 0)
+        self._times = dict.fromkeys(("wait_s", "max_wait_s", "hold_s", "max_hold_s"), 0.0)
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def _connect(self, key=None):
+        conn = super()._connect(key)
+        with self._free:
+            self._counts["opened"] += 1
+        return conn
+
+    def getconn(self, key=None):
+        start = time.perf_counter()
+        exhausted = False
+        while True:
+            with self._free:
+                seen = self._returns
+            try:
+                conn = super().getconn(key)
+                break
+            except pool.PoolError:
+                if self.closed:
+                    raise
+                with self._free:
+                    if not exhausted:
+                        exhausted = True
+                        self._counts["exhausted"] += 1
+                    remaining = start + self.timeout - time.perf_counter()
+                    if remaining <= 0:
+                        self._counts["timeouts"] += 1
+                        raise
+                    if self._returns == seen:
+                        self._waiting += 1
+                        self._free.wait(remaining)
+                        self._waiting -= 1
+
+        now = time.perf_counter()
+        with self._free:
+            wait = now - start
+            self._counts["checkouts"] += 1
+            self._times["wait_s"] += wait
+            self._times["max_wait_s"] = max(self._times["max_wait_s"], wait)
+            self._since[id(conn)] = now
+        return conn
+
+    def putconn(self, conn, key=None, close=False):
+        with self._free:
+            since = self._since.pop(id(conn), None)
+            if since is not None:
+                hold = time.perf_counter() - since
+                self._times["hold_s"] += hold
+                self._times["max_hold_s"] = max(self._times["max_hold_s"], hold)
+        super().putconn(conn, key, close)
+        with self._free:
+            if conn.closed:  # discarded, or closed because minconn were idle
+                self._counts["closed"] += 1
+            self._returns += 1
+            self._free.notify()
+
+    def stats(self):
+        """Current usage and counters since startup; times in milliseconds."""
+        with self._free:
+            checkouts = self._counts["checkouts"]
+            stats = {
+                "minconn": self.minconn, "maxconn": self.maxconn,
+                "in_use": len(self._used), "idle": len(self._pool), "waiting": self._waiting,
+                **self._counts,
+                "avg_wait_ms": round(self._times["wait_s"] * 1000 / checkouts, 2) if checkouts else 0,
+                "max_wait_ms": round(self._times["max_wait_s"] * 1000, 2),
+                "avg_hold_ms": round(self._times["hold_s"] * 1000 / self._returns, 2) if self._returns else 0,
+                "max_hold_ms": round(self._times["max_hold_s"] * 1000, 2),
+            }
+        return stats
+
+
+class Replica:
+    """A read replica's pool and its health as of the last probe."""
+
+    def __init__(self, dsn, minconn, maxconn):
+        self.dsn = dsn
+        params = psycopg2.extensions.parse_dsn(dsn)
+        self.name = f"{params.get('host', 'localhost')}:{params.get('port', 5432)}"
+        self.minconn, self.maxconn = minconn, maxconn
+        self.pool = None
+        self.healthy = False
+        self.lag_s = None
+        self.error = None
+
+    def check(self):
+        """Probe the replica: reachable, and replaying within REPLICA_MAX_LAG_S."""
+        try:
+            if self.pool is None:
+                self.pool = InstrumentedPool(self.minconn, self.maxconn, timeout=0,
+                                             dsn=self.dsn, connect_timeout=3,
+                                             options="-c statement_timeout=10000")
+            try:
+                conn = self.pool.getconn()
+            except pool.PoolError:
+                return  # every connection busy serving reads: keep the last verdict
+            try:
+                conn.autocommit = True
+                cur = conn.cursor()
+                # Lag only counts while WAL is waiting to be replayed; an idle
+                # standby's last replay timestamp just gets old. Not being a
+                # standby at all (e.g. a second local server) counts as no lag.
+                cur.execute("""
+                    SELECT CASE WHEN pg_is_in_recovery()
+                                 AND pg_last_wal_receive_lsn() <> pg_last_wal_replay_lsn()
+                           THEN EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+                           ELSE 0 END
+                """)
+                lag = cur.fetchone()[0]
+                cur.close()
+                conn.autocommit = False
+            finally:
+                self.pool.putconn(conn, close=conn.closed)
+            self.lag_s = float(lag or 0)
+            self.healthy = self.lag_s <= REPLICA_MAX_LAG_S
+            self.error = None if self.healthy else f"replay lag {self.lag_s:.0f}s"
+        except Exception as e:
+            self.mark_down(e)
 
-def init_pool(minconn=2, maxconn=10):
+    def mark_down(self, error):
+        """Stop routing reads here until the next successful probe."""
+        self.healthy = False
+        self.error = str(error).strip()
+
+    def status(self):
+        return {"replica": self.name, "healthy": self.healthy, "lag_s": self.lag_s,
+                "error": self.error, "pool": self.pool.stats() if self.pool else None}
+
+
+def _check_replicas():
+    while True:
+        time.sleep(REPLICA_CHECK_S)
+        for replica in _replicas:
+            replica.check()
+
+
+def init_pool(minconn=None, maxconn=None):
     """Initialize the connection pool. Called once at app startup."""
     global _pool
+    minconn = POOL_MIN if minconn is None else minconn
+    maxconn = POOL_MAX if maxconn is None else maxconn
+    init_replicas(minconn, maxconn)
     try:
         database_url = os.getenv("DATABASE_URL")
         if database_url:
             # Render uses postgres:// but psycopg2 requires postgresql://
             if database_url.startswith("postgres://"):
                 database_url = database_url.replace("postgres://", "postgresql://", 1)
-            _pool = pool.ThreadedConnectionPool(
+            _pool = InstrumentedPool(
                 minconn, maxconn,
+                timeout=POOL_TIMEOUT,
                 dsn=database_url,
                 options="-c statement_timeout=10000",
             )
         else:
-            _pool = pool.ThreadedConnectionPool(
+            _pool = InstrumentedPool(
                 minconn, maxconn,
+                timeout=POOL_TIMEOUT,
                 host=os.getenv("DB_HOST", "localhost"),
                 port=int(os.getenv("DB_PORT", 5432)),
                 user=os.getenv("DB_USER", "postgres"),
@@ -35,35 +237,268 @@ def init_pool(minconn=2, maxconn=10):
                 dbname=os.getenv("DB_NAME", "imdb_clone"),
                 options="-c statement_timeout=10000",   # 10s hard limit
             )
-        print("✅ Database pool initialized")
+        print(f"✅ Database pool initialized ({minconn}–{maxconn} connections)")
     except Exception as e:
         print(f"⚠️  Database pool init failed: {e}")
         _pool = None
 
 
+def init_replicas(minconn, maxconn):
+    """Probe every DB_REPLICA_URLS entry once, then keep probing in the background."""
+    if not REPLICA_URLS or _replicas:
+        return
+    _replicas.extend(Replica(url, minconn, maxconn) for url in REPLICA_URLS)
+    for replica in _replicas:
+        replica.check()
+        print(f"{'✅' if replica.healthy else '⚠️ '} Read replica {replica.name}: "
+              f"{'healthy' if replica.healthy else replica.error}")
+    threading.Thread(target=_check_replicas, name="replica-check", daemon=True).start()
+
+
+def init_app(app):
+    """Return each request's connection to the pool when the request ends."""
+    app.teardown_appcontext(release_request_conn)
+
+
+def pool_stats():
+    """Usage counters of the pool, or None if it failed to initialize."""
+    return _pool.stats() if _pool else None
+
+
+def replica_status():
+    """Health, lag and pool counters of every read replica."""
+    return [replica.status() for replica in _replicas]
+
+
 def get_conn():
-    """Get a connection from the pool."""
+    """Get a connection from the (primary) pool."""
     return _pool.getconn()
 
 
 def put_conn(conn):
-    """Return a connection to the pool."""
+    """Return a connection to the (primary) pool."""
     _pool.putconn(conn)
 
 
+def _read_conn(primary=False):
+    """
+    Check out a connection for reads: from the next healthy replica, else
+    the primary. Returns (connection, replica or None).
+    """
+    healthy = [] if primary else [r for r in _replicas if r.healthy]
+    if healthy:
+        replica = healthy[next(_next_replica) % len(healthy)]
+        try:
+            return replica.pool.getconn(), replica
+        except psycopg2.OperationalError as e:
+            replica.mark_down(e)
+        except pool.PoolError:
+            pass  # replica busy: this read goes to the primary
+    return get_conn(), None
+
+
+def _put_read_conn(conn, replica, close=False):
+    (replica.pool if replica else _pool).putconn(conn, close=close or bool(conn.closed))
+
+
+def request_conn(primary=False):
+    """
+    The current request's read connection, checked out on first use (from
+    a replica if any is healthy). It runs in autocommit mode, so each query
+    is its own implicit transaction and no BEGIN round trip or idle
+    transaction is left between queries.
+    """
+    conn = g.get("db_conn")
+    if conn is None:
+        conn, g.db_replica = _read_conn(primary)
+        conn.autocommit = True
+        g.db_conn = conn
+    return conn
+
+
+def release_request_conn(exc=None):
+    """Teardown hook: hand the request's connection back in its pooled state."""
+    conn = g.pop("db_conn", None)
+    replica = g.pop("db_replica", None)
+    if conn is None:
+        return
+    if conn.closed:
+        _put_read_conn(conn, replica, close=True)
+        return
+    try:
+        conn.rollback()
+        conn.autocommit = False
+        conn.readonly = None
+    except psycopg2.Error:
+        _put_read_conn(conn, replica, close=True)
+        return
+    _put_read_conn(conn, replica)
+
+
+@contextmanager
+def read_only():
+    """
+    Run the enclosed queries of this request in one READ ONLY transaction,
+    so they share a snapshot and can never write. Works as a `with` block
+    or as a route decorator:
+
+        @title_bp.route(...)
+        @read_only()
+        def title_summary(tid): ...
+    """
+    conn = request_conn()
+    if not conn.autocommit:  # nested: the outer block owns the transaction
+        yield conn
+        return
+    conn.autocommit = False
+    conn.readonly = True
+    try:
+        yield conn
+    finally:
+        try:
+            conn.rollback()
+            conn.readonly = None
+            conn.autocommit = True
+        except psycopg2.Error as e:
+            # The connection died, most likely taking the block's query with
+            # it: let that error propagate and discard the connection, so
+            # later queries of this request check out a fresh one.
+            replica = g.get("db_replica")
+            if replica and conn.closed:
+                replica.mark_down(e)
+            release_request_conn()
+
+
+class Statement:
+    """
+    A named query that every connection prepares once and then EXECUTEs.
+    Written with %s placeholders like any query() SQL, and passed to query()
+    in its place. Keeps its call count and latency for statement_stats().
+    """
+
+    def __init__(self, name, sql):
+        if name in STATEMENTS:
+            raise ValueError(f"statement {name!r} is already registered")
+        self.name = name
+        self.sql = sql
+        numbers = itertools.count(1)
+        body = re.sub(r"%[s%]", lambda m: "%" if m.group() == "%%" else f"${next(numbers)}", sql)
+        params = next(numbers) - 1
+        self.prepare_sql = f"PREPARE {name} AS {body}"
+        self.execute_sql = f"EXECUTE {name}" + (f" ({', '.join(['%s'] * params)})" if params else "")
+        self.calls = self.prepares = 0
+        self.total_s = self.max_s = 0.0
+        self._lock = threading.Lock()
+        STATEMENTS[name] = self
+
+    def execute(self, cur, params):
+        if not USE_PREPARED:
+            cur.execute(self.sql, params)
+            return
+        with _prepared_lock:
+            names = _prepared.setdefault(cur.connection, set())
+        if self.name not in names:
+            cur.execute(self.prepare_sql)  # session-level: survives a ROLLBACK
+            names.add(self.name)
+            with self._lock:
+                self.prepares += 1
+        cur.execute(self.execute_sql, params)
+
+    def record(self, elapsed):
+        with self._lock:
+            self.calls += 1
+            self.total_s += elapsed
+            self.max_s = max(self.max_s, elapsed)
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "prepares": self.prepares,
+                    "avg_ms": round(self.total_s * 1000 / self.calls, 2) if self.calls else 0,
+                    "max_ms": round(self.max_s * 1000, 2),
+                    "total_ms": round(self.total_s * 1000, 1)}
+
+
+def statement_stats():
+    """Calls, PREPAREs and latency of every registered Statement."""
+    return {name: stmt.stats() for name, stmt in sorted(STATEMENTS.items())}
+
+
+class Records:
+    """
+    Query rows as plain tuples sharing one column header, as returned by
+    query_rows(). Saves building a dict per row; serialized as a list of
+    objects by jsonio (see webapp/backend/jsonio.py).
+    """
+
+    __slots__ = ("columns", "rows")
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def dicts(self):
+        return [dict(zip(self.columns, row)) for row in self.rows]
+
+
 def query(sql, params=None, one=False):
     """
     Execute a SELECT query and return results as list of dicts.
-    If one=True, return a single dict or None.
+    If one=True, return a single dict or None. `sql` may be a Statement.
     """
-    conn = get_conn()
+    columns, rows = _run(sql, params)
+    if one:
+        return dict(zip(columns, rows[0])) if rows else None
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def query_rows(sql, params=None):
+    """Execute a SELECT query and return its rows as Records (tuples + header)."""
+    return Records(*_run(sql, params))
+
+
+def _run(sql, params):
+    """Run a read query on a read connection. Returns (columns, rows)."""
+    if has_app_context():
+        conn = request_conn()
+        try:
+            return _fetch(conn, sql, params)
+        except psycopg2.OperationalError as e:
+            # A replica that dropped the connection: retry once on the
+            # primary, unless inside read_only() where the snapshot matters.
+            replica = g.get("db_replica")
+            if not (replica and conn.closed and conn.autocommit):
+                raise
+            replica.mark_down(e)
+            release_request_conn()
+            return _fetch(request_conn(primary=True), sql, params)
+
+    conn, replica = _read_conn()
+    try:
+        return _fetch(conn, sql, params)
+    except psycopg2.OperationalError as e:
+        if not (replica and conn.closed):
+            raise
+        replica.mark_down(e)
+        return _run(sql, params)  # the replica is skipped now
+    finally:
+        _put_read_conn(conn, replica)
+
+
+def _fetch(conn, sql, params):
+    cur = conn.cursor()
     try:
-        cur = conn.cursor()
-        cur.execute(sql, params)
+        if isinstance(sql, Statement):
+            start = time.perf_counter()
+            sql.execute(cur, params)
+            rows = cur.fetchall()
+            sql.record(time.perf_counter() - start)
+        else:
+            cur.execute(sql, params)
+            rows = cur.fetchall()
         columns = [desc[0] for desc in cur.description]
-        rows = cur.fetchall()
-        cur.close()
-        results = [dict(zip(columns, row)) for row in rows]
-        return results[0] if one and results else (None if one else results)
     finally:
-        put_conn(conn)
+        cur.close()
+    return columns, rows
@@ -0,0 +1,100 @@
+"""
+Fast JSON Output
+================
+JSON provider and response helpers for the API.
+
+FastJSONProvider serializes with orjson when it is installed, falling back
+to Flask's json module otherwise. Values orjson doesn't know natively
+(Decimal ratings, dates) go through Flask's own default hook, so the wire
+format is the same either way: Decimal as a string, dates as HTTP dates.
+
+json_response() additionally understands db.Records: their tuples are
+turned into objects CHUNK_ROWS at a time and encoded straight away, and
+with stream=True the body is sent to the client chunk by chunk instead of
+being built in memory first.
+"""
+
+import json
+
+from flask import Response, current_app
+from flask.json.provider import DefaultJSONProvider
+
+from .db import Records
+
+try:
+    import orjson  # optional: much faster dumps
+except ImportError:
+    orjson = None
+
+CHUNK_ROWS = 500
+
+
+def _default(obj):
+    if isinstance(obj, Records):
+        return obj.dicts()
+    return DefaultJSONProvider.default(obj)
+
+
+if orjson:
+    # datetimes go to _default, which renders them the way Flask does
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(obj):
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+else:
+    def dumps(obj):
+        return json.dumps(obj, default=_default, ensure_ascii=False,
+                          separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with dumps() unless pretty-printing (debug)."""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(obj)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
+def _chunks(obj):
+    """Yield the JSON encoding of `obj` in pieces, Records CHUNK_ROWS rows at a time."""
+    if isinstance(obj, Records):
+        columns, rows = obj.columns, obj.rows
+        yield b"["
+        for start in range(0, len(rows), CHUNK_ROWS):
+            if start:
+                yield b","
+            yield dumps([dict(zip(columns, row)) for row in rows[start:start + CHUNK_ROWS]])[1:-1]
+        yield b"]"
+    elif isinstance(obj, dict):
+        yield b"{"
+        for i, (key, value) in enumerate(obj.items()):
+            yield (b",\"" if i else b"\"") + dumps(str(key))[1:-1] + b"\":"
+            yield from _chunks(value)
+        yield b"}"
+    elif isinstance(obj, (list, tuple)):
+        yield b"["
+        for i, value in enumerate(obj):
+            if i:
+                yield b","
+            yield from _chunks(value)
+        yield b"]"
+    else:
+        yield dumps(obj)
+
+
+def json_response(obj, status=200, stream=False):
+    """
+    JSON response for `obj`, which may contain Records anywhere in its dicts
+    and lists. With stream=True the body is generated as it is sent.
+    """
+    mimetype = current_app.json.mimetype
+    if stream:
+        return Response(_chunks(obj), status=status, mimetype=mimetype)
+    return Response(b"".join(_chunks(obj)), status=status, mimetype=mimetype)
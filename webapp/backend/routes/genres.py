@@ -4,10 +4,12 @@ GET /api/genres?type=movie|tv
 """
 from flask import Blueprint, jsonify, request
 from ..db import query
+from ..cache import get_cache
 from ..services import tmdb
 
 genres_bp = Blueprint("genres", __name__)
-_cache = {}
+_cache = get_cache("genres")
+CACHE_TTL = 86400  # a day, like the Cache-Control on the response
 
 
 @genres_bp.route("/api/genres")
@@ -15,11 +17,13 @@ def list_genres():
     media_type = request.args.get("type", "movie")
     cache_key = f"genres_{media_type}_{tmdb.is_available()}"
 
-    if cache_key not in _cache:
+    genres = _cache.get(cache_key)
+    if genres is None:
         if tmdb.is_available():
-            _cache[cache_key] = tmdb.get_genres(media_type)
+            genres = tmdb.get_genres(media_type)
         else:
-            rows = query("SELECT genre_id AS id, name FROM genre ORDER BY name")
-            _cache[cache_key] = rows
+            genres = query("SELECT genre_id AS id, name FROM genre ORDER BY name")
+        if genres:  # an empty list means TMDB failed; retry on the next request
+            _cache.set(cache_key, genres, CACHE_TTL)
 
-    return jsonify({"genres": _cache[cache_key]})
+    return jsonify({"genres": genres})
@@ -2,13 +2,24 @@
 Health Check Route
 ==================
 GET /api/health — Verifies server is running and DB is reachable.
+GET /api/internal/pool — Connection pool usage and replica health of this worker (internal).
+GET /api/internal/statements — Prepared statement calls and latency of this worker (internal).
+GET /api/internal/cache — Cache hits, misses, size and evictions of this worker (internal).
 
 Response: { "status": "ok"|"error", "db": "connected"|"error message", "uptime_s": float }
+
+/api/internal/* answer 404 unless the request carries an X-Internal-Token
+header matching INTERNAL_API_TOKEN. Without that variable they only answer
+direct (unproxied) requests from loopback, for local development.
 """
 
+import os
+import hmac
 import time
-from flask import Blueprint, jsonify
-from ..db import get_conn, put_conn
+from flask import Blueprint, jsonify, request
+from ..db import get_conn, put_conn, pool_stats, replica_status, statement_stats
+from ..cache import cache_stats
+from ..services import tmdb
 
 health_bp = Blueprint("health", __name__)
 _start_time = time.time()
@@ -32,3 +43,35 @@ def health():
         "db": db_status,
         "uptime_s": round(time.time() - _start_time, 1),
     })
+
+
+def _internal_denied():
+    token = os.getenv("INTERNAL_API_TOKEN")
+    if token:
+        return not hmac.compare_digest(request.headers.get("X-Internal-Token", ""), token)
+    return (request.remote_addr not in ("127.0.0.1", "::1")
+            or "X-Forwarded-For" in request.headers)
+
+
+@health_bp.route("/api/internal/pool")
+def pool_usage():
+    if _internal_denied():
+        return jsonify({"error": "Not found"}), 404
+    stats = pool_stats()
+    if stats is None:
+        return jsonify({"error": "Database pool not initialized"}), 503
+    return jsonify({"pid": os.getpid(), "pool": stats, "replicas": replica_status()})
+
+
+@health_bp.route("/api/internal/statements")
+def statements():
+    if _internal_denied():
+        return jsonify({"error": "Not found"}), 404
+    return jsonify({"pid": os.getpid(), "statements": statement_stats()})
+
+
+@health_bp.route("/api/internal/cache")
+def cache_usage():
+    if _internal_denied():
+        return jsonify({"error": "Not found"}), 404
+    return jsonify({"pid": os.getpid(), "cache": cache_stats(), "tmdb": tmdb.stats})
@@ -1,22 +1,49 @@
 """
 Home — TMDB trending + top rated, with local DB fallback.
 """
-import time
 from flask import Blueprint, jsonify, request
-from ..db import query
+from ..db import query, Statement
+from ..cache import get_cache, SingleFlight
 from ..services import tmdb
 
 home_bp = Blueprint("home", __name__)
-_cache = {}
+_cache = get_cache("home")
 CACHE_TTL = 300
+_flight = SingleFlight(timeout=30)
+
+# Local-fallback lists, one prepared statement per includeAdult setting.
+_LIST_SQL = """
+    SELECT t.tconst AS id, t.primary_title AS title, t.start_year AS year,
+           t.runtime_minutes AS runtime, t.title_type AS media_type,
+           t.poster_url AS poster, r.average_rating AS rating, r.num_votes AS votes,
+           COALESCE((SELECT string_agg(g.name,', ' ORDER BY g.name)
+             FROM title_genre tg JOIN genre g USING(genre_id)
+             WHERE tg.tconst=t.tconst),'') AS genres
+    FROM title t JOIN rating r ON r.tconst=t.tconst
+    WHERE t.title_type NOT IN ('tvEpisode','videoGame') {where}
+    ORDER BY {order} LIMIT 20
+"""
+TOP_RATED = {adult: Statement(
+    f"home_top_rated{'_adult' if adult else ''}",
+    _LIST_SQL.format(where="AND r.num_votes>=25000" + ("" if adult else " AND t.is_adult = false"),
+                     order="r.average_rating DESC, r.num_votes DESC"))
+    for adult in (False, True)}
+MOST_VOTED = {adult: Statement(
+    f"home_most_voted{'_adult' if adult else ''}",
+    _LIST_SQL.format(where="" if adult else "AND t.is_adult = false", order="r.num_votes DESC"))
+    for adult in (False, True)}
 
 
 def _cached(key, fn):
-    now = time.time()
-    if key in _cache and now - _cache[key]["ts"] < CACHE_TTL:
-        return _cache[key]["data"]
+    data = _cache.get(key)
+    if data is None:
+        data = _flight.do(key, lambda: _fill(key, fn))
+    return data
+
+
+def _fill(key, fn):
     data = fn()
-    _cache[key] = {"data": data, "ts": now}
+    _cache.set(key, data, CACHE_TTL)
     return data
 
 
@@ -35,30 +62,8 @@ def home():
                 "topRated": [tmdb.normalize_title(m, "movie") for m in top.get("results", [])[:20]],
                 "source": "tmdb",
             }
-        adult_filter = "" if include_adult else "AND t.is_adult = false"
-        top_rated = query(f"""
-            SELECT t.tconst AS id, t.primary_title AS title, t.start_year AS year,
-                   t.runtime_minutes AS runtime, t.title_type AS media_type,
-                   t.poster_url AS poster, r.average_rating AS rating, r.num_votes AS votes,
-                   COALESCE((SELECT string_agg(g.name,', ' ORDER BY g.name)
-                     FROM title_genre tg JOIN genre g USING(genre_id)
-                     WHERE tg.tconst=t.tconst),'') AS genres
-            FROM title t JOIN rating r ON r.tconst=t.tconst
-            WHERE t.title_type NOT IN ('tvEpisode','videoGame')
-              AND r.num_votes>=25000 {adult_filter}
-            ORDER BY r.average_rating DESC, r.num_votes DESC LIMIT 20
-        """)
-        most = query(f"""
-            SELECT t.tconst AS id, t.primary_title AS title, t.start_year AS year,
-                   t.runtime_minutes AS runtime, t.title_type AS media_type,
-                   t.poster_url AS poster, r.average_rating AS rating, r.num_votes AS votes,
-                   COALESCE((SELECT string_agg(g.name,', ' ORDER BY g.name)
-                     FROM title_genre tg JOIN genre g USING(genre_id)
-                     WHERE tg.tconst=t.tconst),'') AS genres
-            FROM title t JOIN rating r ON r.tconst=t.tconst
-            WHERE t.title_type NOT IN ('tvEpisode','videoGame') {adult_filter}
-            ORDER BY r.num_votes DESC LIMIT 20
-        """)
+        top_rated = query(TOP_RATED[include_adult])
+        most = query(MOST_VOTED[include_adult])
         return {"trending": most, "topRated": top_rated, "source": "local"}
 
     return jsonify(_cached(cache_key, fetch))
@@ -3,12 +3,25 @@ Person — TMDB person detail with local DB fallback.
 GET /api/person/<id>
 """
 from flask import Blueprint, jsonify
-from ..db import query
+from ..db import query, query_rows, read_only, Records, Statement
+from ..jsonio import json_response
 from ..services import tmdb
 from collections import OrderedDict
 
 person_bp = Blueprint("person", __name__)
 
+# Local-fallback queries, prepared once per connection.
+PERSON_INFO = Statement("person_info", """
+    SELECT nconst AS id, primary_name AS name, birth_year, death_year FROM person WHERE nconst=%s
+""")
+PERSON_FILMOGRAPHY = Statement("person_filmography", """
+    SELECT pr.category, t.tconst AS id, t.primary_title AS title, t.title_type AS media_type,
+           t.start_year AS year, r.average_rating AS rating, pr.characters AS character
+    FROM principal pr JOIN title t ON t.tconst=pr.tconst
+    LEFT JOIN rating r ON r.tconst=t.tconst
+    WHERE pr.nconst=%s ORDER BY t.start_year DESC NULLS LAST
+""")
+
 
 def _is_local_id(pid):
     return isinstance(pid, str) and pid.startswith("nm")
@@ -56,23 +69,18 @@ def person_detail(pid):
         })
 
     # Local DB fallback
-    info = query("SELECT nconst AS id, primary_name AS name, birth_year, death_year FROM person WHERE nconst=%s", (pid,), one=True)
-    if not info:
-        return jsonify({"error": "Person not found"}), 404
-    rows = query("""
-        SELECT pr.category, t.tconst AS id, t.primary_title AS title, t.title_type AS media_type,
-               t.start_year AS year, r.average_rating AS rating, pr.characters AS character
-        FROM principal pr JOIN title t ON t.tconst=pr.tconst
-        LEFT JOIN rating r ON r.tconst=t.tconst
-        WHERE pr.nconst=%s ORDER BY t.start_year DESC NULLS LAST
-    """, (pid,))
+    with read_only():
+        info = query(PERSON_INFO, (pid,), one=True)
+        if not info:
+            return jsonify({"error": "Person not found"}), 404
+        rows = query_rows(PERSON_FILMOGRAPHY, (pid,))
     filmography = OrderedDict()
-    for r in rows:
-        cat = r.pop("category")
-        if cat not in filmography:
-            filmography[cat] = []
-        if len(filmography[cat]) < 50:
-            filmography[cat].append(r)
-    info["filmography"] = filmography
+    for r in rows.rows:  # tuples; category is the first column
+        group = filmography.setdefault(r[0], [])
+        if len(group) < 50:
+            group.append(r[1:])
+    columns = rows.columns[1:]
+    info["filmography"] = OrderedDict((cat, Records(columns, group))
+                                      for cat, group in filmography.items())
     info["source"] = "local"
-    return jsonify(info)
+    return json_response(info)
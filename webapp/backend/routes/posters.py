@@ -81,5 +81,7 @@ def get_poster(tconst):
         _cache_poster(tconst, poster_url)
         return jsonify({"tconst": tconst, "poster_url": poster_url})
 
-    # 3. Fallback placeholder
-    return jsonify({"tconst": tconst, "poster_url": PLACEHOLDER})
+    # 3. Fallback placeholder — not cacheable, the TMDB failure may be transient
+    resp = jsonify({"tconst": tconst, "poster_url": PLACEHOLDER})
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
@@ -18,7 +18,8 @@ Response shapes:
 """
 
 from flask import Blueprint, jsonify, request
-from ..db import query
+from ..db import query, query_rows
+from ..jsonio import json_response
 
 series_bp = Blueprint("series", __name__)
 
@@ -56,7 +57,7 @@ def episodes(tconst):
     season_filter = "AND e.season_number = %s" if season else ""
     params = (tconst, season) if season else (tconst,)
 
-    rows = query(f"""
+    rows = query_rows(f"""
         SELECT e.tconst, t.primary_title, e.season_number, e.episode_number,
                t.start_year, t.runtime_minutes,
                r.average_rating, r.num_votes
@@ -67,9 +68,10 @@ def episodes(tconst):
         ORDER BY e.season_number, e.episode_number
     """, params)
 
-    return jsonify({
+    # all seasons of a long-running show can be thousands of rows: stream them
+    return json_response({
         "tconst": info["tconst"],
         "primary_title": info["primary_title"],
         "season": season,
         "episodes": rows,
-    })
+    }, stream=True)
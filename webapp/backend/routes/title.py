@@ -4,7 +4,8 @@ GET /api/title/<id>?type=movie|tv
 GET /api/title/<id>/full-credits
 """
 from flask import Blueprint, jsonify, request
-from ..db import query
+from ..db import query, query_rows, read_only, Records, Statement
+from ..jsonio import json_response
 from ..services import tmdb
 from collections import OrderedDict
 
@@ -16,6 +17,38 @@ PLACEHOLDER = ("data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' "
     "font-family='sans-serif'%3ENo Poster%3C/text%3E%3C/svg%3E")
 
 
+# Local-fallback queries, prepared once per connection.
+TITLE_INFO = Statement("title_info", """
+    SELECT t.tconst AS id, t.primary_title AS title, t.original_title,
+           t.title_type AS media_type, t.start_year AS year, t.end_year,
+           t.runtime_minutes AS runtime, t.is_adult AS adult,
+           t.poster_url AS poster, r.average_rating AS rating, r.num_votes AS votes
+    FROM title t LEFT JOIN rating r ON r.tconst=t.tconst
+    WHERE t.tconst=%s
+""")
+TITLE_GENRES = Statement("title_genres", """
+    SELECT g.name FROM title_genre tg JOIN genre g USING(genre_id) WHERE tg.tconst=%s ORDER BY g.name
+""")
+TITLE_CREW = Statement("title_crew", """
+    SELECT p.nconst AS id, p.primary_name AS name, pr.category
+    FROM principal pr JOIN person p ON p.nconst=pr.nconst
+    WHERE pr.tconst=%s AND pr.category IN ('director','writer')
+    ORDER BY pr.ordering
+""")
+TITLE_CAST = Statement("title_cast", """
+    SELECT p.nconst AS id, p.primary_name AS name, pr.characters AS character
+    FROM principal pr JOIN person p ON p.nconst=pr.nconst
+    WHERE pr.tconst=%s AND pr.category IN ('actor','actress')
+    ORDER BY pr.ordering LIMIT 15
+""")
+TITLE_NAME = Statement("title_name", "SELECT tconst AS id, primary_title AS title FROM title WHERE tconst=%s")
+TITLE_CREDITS = Statement("title_credits", """
+    SELECT pr.category, p.nconst AS id, p.primary_name AS name, pr.job, pr.characters AS character, pr.ordering
+    FROM principal pr JOIN person p ON p.nconst=pr.nconst
+    WHERE pr.tconst=%s ORDER BY pr.ordering
+""")
+
+
 def _is_local_id(tid):
     return isinstance(tid, str) and tid.startswith("tt")
 
@@ -83,34 +116,18 @@ def title_summary(tid):
         return jsonify(info)
 
     # ── Local DB fallback ──
-    info = query("""
-        SELECT t.tconst AS id, t.primary_title AS title, t.original_title,
-               t.title_type AS media_type, t.start_year AS year, t.end_year,
-               t.runtime_minutes AS runtime, t.is_adult AS adult,
-               t.poster_url AS poster, r.average_rating AS rating, r.num_votes AS votes
-        FROM title t LEFT JOIN rating r ON r.tconst=t.tconst
-        WHERE t.tconst=%s
-    """, (tid,), one=True)
-    if not info:
-        return jsonify({"error": "Title not found"}), 404
-    if not info.get("poster"):
-        info["poster"] = PLACEHOLDER
-    genres = query("SELECT g.name FROM title_genre tg JOIN genre g USING(genre_id) WHERE tg.tconst=%s ORDER BY g.name", (tid,))
-    info["genres"] = [g["name"] for g in genres]
-    crew = query("""
-        SELECT p.nconst AS id, p.primary_name AS name, pr.category
-        FROM principal pr JOIN person p ON p.nconst=pr.nconst
-        WHERE pr.tconst=%s AND pr.category IN ('director','writer')
-        ORDER BY pr.ordering
-    """, (tid,))
-    info["directors"] = [c for c in crew if c["category"] == "director"]
-    info["writers"] = [c for c in crew if c["category"] == "writer"]
-    cast = query("""
-        SELECT p.nconst AS id, p.primary_name AS name, pr.characters AS character
-        FROM principal pr JOIN person p ON p.nconst=pr.nconst
-        WHERE pr.tconst=%s AND pr.category IN ('actor','actress')
-        ORDER BY pr.ordering LIMIT 15
-    """, (tid,))
+    with read_only():  # four lookups, one snapshot
+        info = query(TITLE_INFO, (tid,), one=True)
+        if not info:
+            return jsonify({"error": "Title not found"}), 404
+        if not info.get("poster"):
+            info["poster"] = PLACEHOLDER
+        genres = query(TITLE_GENRES, (tid,))
+        info["genres"] = [g["name"] for g in genres]
+        crew = query(TITLE_CREW, (tid,))
+        info["directors"] = [c for c in crew if c["category"] == "director"]
+        info["writers"] = [c for c in crew if c["category"] == "writer"]
+        cast = query(TITLE_CAST, (tid,))
     info["cast"] = cast
     info["providers"] = []
     info["similar"] = []
@@ -143,18 +160,16 @@ def full_credits(tid):
         return jsonify({"id": tmdb_id, "title": title, "cast": cast, "crew": crew_groups, "source": "tmdb"})
 
     # Local fallback
-    info = query("SELECT tconst AS id, primary_title AS title FROM title WHERE tconst=%s", (tid,), one=True)
-    if not info:
-        return jsonify({"error": "Not found"}), 404
-    rows = query("""
-        SELECT pr.category, p.nconst AS id, p.primary_name AS name, pr.job, pr.characters AS character, pr.ordering
-        FROM principal pr JOIN person p ON p.nconst=pr.nconst
-        WHERE pr.tconst=%s ORDER BY pr.ordering
-    """, (tid,))
+    with read_only():
+        info = query(TITLE_NAME, (tid,), one=True)
+        if not info:
+            return jsonify({"error": "Not found"}), 404
+        rows = query_rows(TITLE_CREDITS, (tid,))
     credits_grouped = OrderedDict()
-    for r in rows:
-        cat = r["category"]
-        if cat not in credits_grouped:
-            credits_grouped[cat] = []
-        credits_grouped[cat].append(r)
-    return jsonify({"id": info["id"], "title": info["title"], "credits": credits_grouped, "source": "local"})
+    for r in rows.rows:  # tuples; category is the first column
+        credits_grouped.setdefault(r[0], []).append(r)
+    credits_grouped = OrderedDict((cat, Records(rows.columns, group))
+                                  for cat, group in credits_grouped.items())
+    # big productions have thousands of credits: stream them out
+    return json_response({"id": info["id"], "title": info["title"], "credits": credits_grouped,
+                          "source": "local"}, stream=True)
@@ -2,17 +2,25 @@
 TMDB API Service
 =================
 Client for The Movie Database (TMDB) API v3.
-Includes in-memory caching (10-min TTL) and response normalization.
+Responses are cached in the configured cache backend (see cache.py), keyed
+without the API key, and normalized. After 10 minutes an entry is stale:
+it is still returned at once while a background thread refetches it.
+With TMDB_CACHE_PATH set, responses are also kept compressed in a SQLite
+file, so a restarted worker starts from them instead of from TMDB.
 Falls back gracefully when TMDB_API_KEY is not set.
 """
 
 import os
 import json
 import time
+import sqlite3
+import threading
 import urllib.request
 import urllib.parse
 import urllib.error
 
+from ..cache import get_cache, SingleFlight, CompressedJSONCache
+
 def _key():
     """Read TMDB key lazily so load_dotenv() runs first."""
     return os.getenv("TMDB_API_KEY", "")
@@ -20,33 +28,96 @@ def _key():
 BASE = "https://api.themoviedb.org/3"
 IMG = "https://image.tmdb.org/t/p"
 
-_cache = {}
-CACHE_TTL = 600  # 10 minutes
+_cache = get_cache("tmdb")
+CACHE_TTL = 600   # 10 minutes fresh ...
+STALE_TTL = 3600  # ... then served stale for up to an hour while it is refetched
+
+# Optional second tier on disk that survives restarts and deploys
+_disk = CompressedJSONCache(os.environ["TMDB_CACHE_PATH"]) if os.getenv("TMDB_CACHE_PATH") else None
+
+_refreshing = set()
+_refresh_lock = threading.Lock()
+stats = {"disk_hits": 0, "stale_served": 0, "refreshed": 0, "refresh_errors": 0}
+_flight = SingleFlight(timeout=10)  # one fetch per missing key; the others wait for it
 
 
 def is_available():
     return bool(_key())
 
 
+def _fetch(key, url):
+    """GET `url` and cache the response under `key`."""
+    req = urllib.request.Request(url, headers={
+        "Accept": "application/json", "User-Agent": "IMDbClone/2.0"
+    })
+    with urllib.request.urlopen(req, timeout=8) as resp:
+        raw = resp.read()
+    data = json.loads(raw)
+    entry = {"data": data, "ts": time.time()}
+    _cache.set(key, entry, CACHE_TTL + STALE_TTL, size=len(raw))
+    if _disk is not None:
+        try:
+            _disk.set(key, entry, CACHE_TTL + STALE_TTL)
+        except sqlite3.Error as e:
+            print(f"[TMDB] Disk cache error: {e}")
+    return data
+
+
+def _lookup(key):
+    """Cached entry for `key` from memory, else from the disk tier."""
+    entry = _cache.get(key)
+    if entry is not None or _disk is None:
+        return entry
+    try:
+        entry = _disk.get(key)
+    except sqlite3.Error as e:
+        print(f"[TMDB] Disk cache error: {e}")
+        return None
+    if entry is not None:
+        stats["disk_hits"] += 1
+        _cache.set(key, entry, max(1, entry["ts"] + CACHE_TTL + STALE_TTL - time.time()))
+    return entry
+
+
+def _refresh(key, url):
+    try:
+        _fetch(key, url)
+        stats["refreshed"] += 1
+    except Exception as e:
+        stats["refresh_errors"] += 1
+        print(f"[TMDB] Refresh error: {e}")
+    finally:
+        with _refresh_lock:
+            _refreshing.discard(key)
+
+
+def _refresh_later(key, url):
+    """Refetch `key` on a background thread, unless that is already happening."""
+    with _refresh_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    threading.Thread(target=_refresh, args=(key, url), daemon=True).start()
+
+
 def _get(endpoint, params=None):
     k = _key()
     if not k:
         return None
-    p = {"api_key": k, "language": "en-US"}
+    p = {"language": "en-US"}
     if params:
         p.update(params)
-    url = f"{BASE}{endpoint}?{urllib.parse.urlencode(p)}"
-    now = time.time()
-    if url in _cache and now - _cache[url]["ts"] < CACHE_TTL:
-        return _cache[url]["data"]
+    query = urllib.parse.urlencode(p)
+    key = f"{endpoint}?{query}"
+    url = f"{BASE}{endpoint}?api_key={urllib.parse.quote(k)}&{query}"
+    entry = _lookup(key)
+    if entry is not None:
+        if time.time() - entry["ts"] >= CACHE_TTL:
+            stats["stale_served"] += 1
+            _refresh_later(key, url)
+        return entry["data"]
     try:
-        req = urllib.request.Request(url, headers={
-            "Accept": "application/json", "User-Agent": "IMDbClone/2.0"
-        })
-        with urllib.request.urlopen(req, timeout=8) as resp:
-            data = json.loads(resp.read())
-        _cache[url] = {"data": data, "ts": now}
-        return data
+        return _flight.do(key, lambda: _fetch(key, url))
     except Exception as e:
         print(f"[TMDB] Error: {e}")
         return None